@@ -0,0 +1,284 @@
+"""
+Замеры горячих путей отрисовки и опроса датчиков на поддельном экране, без терминала.
+
+Запуск из корня проекта:
+    python -m benchmarks.render            сравнить с сохранённой базой, код 1 при росте вывода или памяти
+    python -m benchmarks.render --save     сохранить текущие результаты как базу
+"""
+import os
+import sys
+import json
+import errno
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from time import perf_counter
+from datetime import datetime
+from collections import namedtuple
+from dataclasses import replace
+from unittest import mock
+
+import psutil
+
+import core.visualisation
+from core.run import RunProgram
+from core.hwmon import HwmonReader
+
+FIXED_TIME: float = datetime(2024, 1, 1, 12, 34, 56).timestamp()
+ZONES: tuple[str, ...] = (
+    'UTC', 'Europe/London', 'Europe/Berlin', 'Europe/Moscow', 'Asia/Dubai', 'Asia/Kolkata', 'Asia/Shanghai',
+    'Asia/Tokyo', 'Australia/Sydney', 'Pacific/Auckland', 'America/Sao_Paulo', 'America/New_York',
+    'America/Chicago', 'America/Denver', 'America/Los_Angeles', 'Pacific/Honolulu'
+)
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), 'baseline.json')
+SensorEntry = namedtuple('shwtemp', 'label current high critical')
+SENSORS: dict[str, list] = {
+    'k10temp': [SensorEntry('Tctl', 45.5, None, None)],
+    'amdgpu': [SensorEntry('edge', 41.0, 95.0, 100.0)],
+    'spd5118': [SensorEntry('', 38.25, 55.0, 85.0)],
+    'nvme': [SensorEntry('Composite', 36.85, 81.85, 84.85)],
+    'acpitz': [SensorEntry('', 27.8, None, None)],
+    **{f'other{i}': [SensorEntry('', 30.0 + i, None, None)] for i in range(20)}
+}
+
+
+def get_fixed_time() -> float:
+    """Время, застывшее на одном значении, чтобы объём вывода цифр не зависел от момента запуска."""
+    return FIXED_TIME
+
+
+class FakeScreen:
+    """Экран в памяти, считающий вызовы addstr и выведенные байты."""
+
+    def __init__(self, height: int = 50, width: int = 200):
+        self.height = height
+        self.width = width
+        self.calls: int = 0
+        self.bytes: int = 0
+
+    def addstr(self, y: int, x: int, text: str, attribute: int = 0) -> None:
+        self.calls += 1
+        self.bytes += len(text.encode())
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def noutrefresh(self) -> None:
+        pass
+
+    def refresh(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class OpenCounter:
+    """Считает открытия файлов через аудит-события интерпретатора."""
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.count: int = 0
+        sys.addaudithook(self.hook)
+
+    def hook(self, event: str, _args) -> None:
+        if self.enabled and event == 'open':
+            self.count += 1
+
+
+def create_sysfs(root: str) -> None:
+    """Создаёт поддельное дерево hwmon с теми же устройствами, что и поддельный psutil."""
+    for i, (name, entries) in enumerate(SENSORS.items()):
+        directory: str = os.path.join(root, f'hwmon{i}')
+        os.mkdir(directory)
+        with open(os.path.join(directory, 'name'), 'w', encoding='UTF-8') as file:
+            file.write(f'{name}\n')
+        with open(os.path.join(directory, 'temp1_input'), 'w', encoding='UTF-8') as file:
+            file.write(f'{int(entries[0].current * 1000)}\n')
+
+
+def verify_sysfs(hwmon: HwmonReader) -> list[str]:
+    """
+    Проверяет значения, прочитанные из поддельного дерева hwmon, и поведение при ошибках чтения:
+    разовая ошибка пропускает одно показание, повторные — закрывают файл и находят устройство заново.
+    """
+    errors: list[str] = []
+    expected: dict[str, float] = {name: int(entries[0].current * 1000) / 1000 for name, entries in SENSORS.items()}
+    values: dict[str, float] = hwmon.read()
+    if values != expected:
+        errors.append(f'sysfs: прочитано {values}, ожидалось {expected}')
+    name: str = next(iter(SENSORS))
+    failing: int = hwmon.handles[name]
+    preadv = os.preadv
+
+    def flaky(fd: int, buffers, offset: int) -> int:
+        if fd == failing:
+            raise OSError(errno.EIO, os.strerror(errno.EIO))
+        return preadv(fd, buffers, offset)
+
+    with mock.patch.object(os, 'preadv', flaky):
+        values = hwmon.read()
+    if name in values or hwmon.handles.get(name) != failing or values.get('acpitz') != expected['acpitz']:
+        errors.append(f'sysfs: разовая ошибка чтения «{name}» должна пропускать только одно показание')
+    if hwmon.read() != expected:
+        errors.append(f'sysfs: «{name}» не читается после разовой ошибки')
+    with mock.patch.object(os, 'preadv', flaky):
+        for _ in range(hwmon.max_failures):
+            hwmon.read()
+    if name in hwmon.handles or name not in hwmon.lost:
+        errors.append(f'sysfs: «{name}» не закрыт после {hwmon.max_failures} ошибок подряд')
+    if hwmon.read() != expected or hwmon.lost:
+        errors.append(f'sysfs: «{name}» не найден заново после повторных ошибок')
+    return errors
+
+
+def create_cases(program: RunProgram, screen: FakeScreen, hwmon: HwmonReader) -> dict:
+    """Возвращает замеряемые функции одного кадра."""
+
+    def cold(function):
+        def frame() -> None:
+            program.invalidate_frame()
+            function(screen)
+        return frame
+
+    def read_sysfs() -> None:
+        program.hwmon = hwmon
+        program.get_temperature_info()
+        program.hwmon = None
+
+    def with_zones(count: int):
+        settings = replace(program.settings, world_clock=ZONES[:count])
+
+        def frame() -> None:
+            current, program.settings = program.settings, settings
+            program.invalidate_frame()
+            program.display_digits(screen)
+            program.settings = current
+        return frame
+
+    return {
+        'display_digits': cold(program.display_digits),
+        'display_digits_steady': lambda: program.display_digits(screen),
+        'display_system_info': cold(program.display_system_info),
+        'temperature_psutil': program.get_temperature_info,
+        'temperature_sysfs': read_sysfs,
+        'info_modules': cold(program.get_info_modules),
+        'info_modules_steady': lambda: program.get_info_modules(screen),
+        'display_digits_zones_4': with_zones(4),
+        'display_digits_zones_16': with_zones(16)
+    }
+
+
+def measure(function, screen: FakeScreen, counter: OpenCounter, frames: int, repeats: int = 5) -> dict[str, float]:
+    """
+    Замеряет функцию: кадры в секунду (лучший из нескольких прогонов, чтобы меньше зависеть от шума),
+    вызовы addstr, байты, открытия файлов и пик выделенной памяти на кадр.
+    """
+    function()
+    screen.calls = screen.bytes = counter.count = 0
+    counter.enabled = True
+    best: float = float('inf')
+    for _ in range(repeats):
+        start: float = perf_counter()
+        for _ in range(frames):
+            function()
+        best = min(best, perf_counter() - start)
+    counter.enabled = False
+    total: int = frames * repeats
+    result: dict[str, float] = {
+        'frames_per_second': round(frames / best, 1),
+        'addstr_per_frame': screen.calls / total,
+        'bytes_per_frame': screen.bytes / total,
+        'file_opens_per_frame': counter.count / total
+    }
+    tracemalloc.start()
+    peaks: list[int] = []
+    for _ in range(min(frames, 100)):
+        tracemalloc.reset_peak()
+        baseline: int = tracemalloc.get_traced_memory()[0]
+        function()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    result['peak_alloc_bytes_per_frame'] = sorted(peaks)[len(peaks) // 2]
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Сравнивает с базой воспроизводимые счётчики (вызовы addstr, байты, открытия файлов, пик памяти)
+    и возвращает список регрессий. Кадры в секунду зависят от машины и её загрузки, поэтому не сравниваются.
+    """
+    regressions: list[str] = []
+    for case, metrics in results.items():
+        base: dict | None = baseline.get(case)
+        if base is None:
+            continue
+        for key in ('addstr_per_frame', 'bytes_per_frame', 'file_opens_per_frame'):
+            if metrics[key] > base[key]:
+                regressions.append(f'{case}: {key} {metrics[key]} > {base[key]}')
+        if metrics['peak_alloc_bytes_per_frame'] > base['peak_alloc_bytes_per_frame'] * (1 + tolerance) + 1024:
+            regressions.append(
+                f'{case}: peak_alloc_bytes_per_frame {metrics["peak_alloc_bytes_per_frame"]} '
+                f'> {base["peak_alloc_bytes_per_frame"]}'
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Замеры отрисовки и опроса датчиков на поддельном экране')
+    parser.add_argument('--frames', type=int, default=1000, help='число кадров в одном прогоне')
+    parser.add_argument('--save', action='store_true', help='сохранить результаты как базу')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='допустимый рост пика памяти (доля)')
+    arguments = parser.parse_args()
+
+    counter = OpenCounter()
+    screen = FakeScreen()
+    with tempfile.TemporaryDirectory() as root, \
+            mock.patch.object(psutil, 'sensors_temperatures', return_value=SENSORS, create=True), \
+            mock.patch.object(core.visualisation, 'doupdate', lambda: None), \
+            mock.patch.object(core.visualisation, 'color_pair', lambda pair: pair << 8), \
+            mock.patch.object(core.visualisation, 'has_colors', lambda: False), \
+            mock.patch.object(core.visualisation, 'time', get_fixed_time):
+        create_sysfs(root)
+        hwmon = HwmonReader(tuple(SENSORS), root)
+        errors: list[str] = verify_sysfs(hwmon)
+        program = RunProgram()
+        program.sensors_backend = 'psutil'
+        program.static_info = program.get_static_info()
+        program.info = (program.get_login(), platform.node(), *program.static_info, None)
+        program.update_temperature_info()
+        program.build_color_table()
+        program.apply_layout(screen)
+        cases: dict = create_cases(program, screen, hwmon)
+        results: dict = {name: measure(function, screen, counter, arguments.frames) for name, function in cases.items()}
+        hwmon.close()
+
+    for name, metrics in results.items():
+        print(f'{name:<24}' + '  '.join(f'{key}={value}' for key, value in metrics.items()))
+    for error in errors:
+        print(f'ОШИБКА {error}')
+    if errors:
+        return 1
+    if arguments.save:
+        with open(BASELINE_PATH, 'w', encoding='UTF-8') as file:
+            json.dump(results, file, indent=4)
+        print(f'База сохранена: {BASELINE_PATH}')
+        return 0
+    if not os.path.exists(BASELINE_PATH):
+        print('База не найдена, запусти с --save')
+        return 0
+    with open(BASELINE_PATH, encoding='UTF-8') as file:
+        baseline: dict = json.load(file)
+    for name, metrics in results.items():
+        if name in baseline:
+            change: float = metrics['frames_per_second'] / baseline[name]['frames_per_second'] - 1
+            print(f'{name:<24}frames_per_second {change:+.0%} к базе (справочно)')
+    regressions: list[str] = compare(results, baseline, arguments.tolerance)
+    for regression in regressions:
+        print(f'РЕГРЕССИЯ {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
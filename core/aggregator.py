@@ -0,0 +1,185 @@
+import os
+import math
+import random
+import socket
+import struct
+from time import monotonic
+from heapq import nlargest
+from threading import Lock
+from typing import NamedTuple
+from collections import OrderedDict
+
+from .workers import Worker, resolve_interval
+from .backends import Sample, OutputBackend, TEMPERATURE_FIELDS
+
+MAGIC: bytes = b'CLK1'
+FRAME = struct.Struct(f'<4sBd{len(TEMPERATURE_FIELDS) + 1}f')
+MAX_FRAME_SIZE: int = FRAME.size + 255
+
+
+class HostReading(NamedTuple):
+    """Последние показания одного хоста и момент их получения по монотонным часам."""
+    host: str
+    timestamp: float
+    values: tuple[float | None, ...]
+    average: float | None
+    received: float
+
+
+def encode_frame(host: str, timestamp: float, values: tuple[float | None, ...], average: float | None) -> bytes:
+    """
+    Упаковывает показания в компактный кадр: сигнатура, длина имени хоста, время, температуры компонентов
+    и средняя во float32 (NaN вместо отсутствующих значений), затем имя хоста в UTF-8 (до 255 байт).
+    """
+    name: bytes = host.encode()[:255]
+    numbers: list[float] = [math.nan if value is None else value for value in (*values, average)]
+    return FRAME.pack(MAGIC, len(name), timestamp, *numbers) + name
+
+
+def decode_frame(data: bytes | memoryview, received: float) -> HostReading:
+    """Распаковывает кадр, ValueError означает повреждённый или чужой пакет."""
+    if len(data) < FRAME.size:
+        raise ValueError('Слишком короткий кадр')
+    magic, length, timestamp, *numbers = FRAME.unpack_from(data)
+    if magic != MAGIC or len(data) != FRAME.size + length:
+        raise ValueError('Неизвестный формат кадра')
+    values: tuple = tuple(None if math.isnan(number) else round(number, 2) for number in numbers)
+    host: str = bytes(data[FRAME.size:]).decode(errors='replace')
+    return HostReading(host, timestamp, values[:-1], values[-1], received)
+
+
+def parse_address(address: str) -> tuple[int, str | tuple[str, int]]:
+    """Разбирает адрес вида «unix:PATH» или «[HOST:]PORT» в семейство сокета и адрес."""
+    if address.startswith('unix:'):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError('Unix-сокеты недоступны в этой системе')
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class HostTable:
+    """
+    Ограниченная таблица последних показаний хостов. Записи упорядочены по времени получения, поэтому
+    устаревшие и самые старые при переполнении удаляются с начала за O(1) на запись.
+    """
+    __slots__ = ('capacity', 'ttl', 'readings', 'lock', 'evicted')
+
+    def __init__(self, capacity: int, ttl):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.readings: OrderedDict[str, HostReading] = OrderedDict()
+        self.lock = Lock()
+        self.evicted: int = 0
+
+    def __len__(self) -> int:
+        return len(self.readings)
+
+    def update(self, reading: HostReading) -> None:
+        """Запоминает показания хоста, вытесняя самую старую запись при переполнении."""
+        with self.lock:
+            self.readings.pop(reading.host, None)
+            if len(self.readings) >= self.capacity:
+                self.readings.popitem(last=False)
+                self.evicted += 1
+            self.readings[reading.host] = reading
+
+    def evict_stale(self, now: float) -> None:
+        """Удаляет записи, не обновлявшиеся дольше срока хранения."""
+        deadline: float = now - resolve_interval(self.ttl)
+        with self.lock:
+            while self.readings and next(iter(self.readings.values())).received < deadline:
+                self.readings.popitem(last=False)
+                self.evicted += 1
+
+    def get_hottest(self, count: int) -> list[HostReading]:
+        """Возвращает не больше count самых горячих по средней температуре хостов."""
+        self.evict_stale(monotonic())
+        with self.lock:
+            readings: list[HostReading] = list(self.readings.values())
+        return nlargest(count, readings, key=lambda reading: -math.inf if reading.average is None else reading.average)
+
+
+class AggregatorReceiver(Worker):
+    """Фоновый поток, принимающий кадры по UDP или Unix-сокету и складывающий их в таблицу хостов."""
+
+    def __init__(self, address: str, table: HostTable, timeout: float = 0.25):
+        super().__init__(name='aggregator')
+        self.table = table
+        self.family, self.address = parse_address(address)
+        self.is_unix: bool = self.family == getattr(socket, 'AF_UNIX', None)
+        if self.is_unix and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.socket = socket.socket(self.family, socket.SOCK_DGRAM)
+        self.socket.bind(self.address)
+        self.socket.settimeout(timeout)
+        self.buffer = bytearray(MAX_FRAME_SIZE)
+        self.received: int = 0
+        self.invalid: int = 0
+
+    def run(self) -> None:
+        """Принимает кадры до остановки потока, повреждённые пакеты только подсчитываются."""
+        view = memoryview(self.buffer)
+        while not self.stop_event.is_set():
+            try:
+                size: int = self.socket.recv_into(self.buffer)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                self.table.update(decode_frame(view[:size], monotonic()))
+                self.received += 1
+            except ValueError:
+                self.invalid += 1
+
+    def close(self) -> None:
+        """Останавливает поток и закрывает сокет."""
+        self.stop()
+        if self.is_alive():
+            self.join(1.0)
+        self.socket.close()
+        if self.is_unix and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class FrameSender(OutputBackend):
+    """Отправляет каждый отсчёт агрегатору одним кадром."""
+
+    def __init__(self, address: str, host: str | None = None):
+        self.family, self.address = parse_address(address)
+        self.socket = socket.socket(self.family, socket.SOCK_DGRAM)
+        self.host = host or socket.gethostname()
+
+    def write(self, sample: Sample) -> None:
+        """Упаковывает снимок датчиков и отправляет его без ожидания ответа."""
+        self.socket.sendto(
+            encode_frame(self.host, sample.timestamp, sample.sensors.values, sample.sensors.average), self.address
+        )
+
+    def close(self) -> None:
+        """Закрывает сокет."""
+        self.socket.close()
+
+
+class SimulatedHostsSender(FrameSender):
+    """
+    Заменитель стойки для проверки без сети: на каждый отсчёт отправляет кадры count вымышленных хостов,
+    температуры которых случайно блуждают вокруг показаний локальной машины.
+    """
+
+    def __init__(self, address: str, count: int, seed: int | None = None):
+        super().__init__(address, 'sim')
+        self.random = random.Random(seed)
+        self.offsets: list[float] = [self.random.uniform(-10.0, 25.0) for _ in range(count)]
+
+    def write(self, sample: Sample) -> None:
+        """Отправляет по кадру на каждый вымышленный хост."""
+        for i, offset in enumerate(self.offsets):
+            offset = self.offsets[i] = min(40.0, max(-15.0, offset + self.random.uniform(-1.0, 1.0)))
+            values: tuple = tuple(
+                round((value or 40.0) + offset + self.random.uniform(-2.0, 2.0), 1) for value in sample.sensors.values
+            )
+            self.socket.sendto(
+                encode_frame(f'rack-{i:03d}', sample.timestamp, values, sum(values) / len(values)), self.address
+            )
@@ -0,0 +1,192 @@
+import os
+import sys
+import signal
+import asyncio
+
+from .run import RunProgram
+from .scheduler import TickScheduler
+from .visualisation import initscr, endwin, echo, noecho, cbreak, nocbreak, start_color
+
+
+class AsyncRunProgram(RunProgram):
+    """
+    Программа с дополнительным режимом работы на asyncio: часы, информация о системе и опрос датчиков
+    выполняются сопрограммами, блокирующие вызовы уходят в пул потоков через run_in_executor,
+    а клавиатура и сигналы обрабатываются самим циклом событий. Подходит для встраивания в приложения,
+    уже работающие на asyncio (Linux и macOS).
+    """
+    __slots__ = ('task_events',)
+
+    def __init__(self):
+        super().__init__()
+        self.task_events: list[asyncio.Event] = []
+
+    @staticmethod
+    def open_screen():
+        """Инициализирует curses так же, как curses.wrapper, но без блокирующего вызова."""
+        stdscr = initscr()
+        noecho()
+        cbreak()
+        stdscr.keypad(True)
+        try:
+            start_color()
+        except Exception:
+            pass
+        return stdscr
+
+    @staticmethod
+    def close_screen(stdscr) -> None:
+        """Возвращает терминал в исходное состояние."""
+        stdscr.keypad(False)
+        echo()
+        nocbreak()
+        endwin()
+
+    def read_keys(self, stdscr) -> None:
+        """
+        Считывает все доступные нажатия клавиш, когда цикл событий сообщает о данных в stdin.
+        Если данных нет, проверяется, не закрыт ли стандартный ввод.
+        """
+        keys: list[int] = []
+        while (key := stdscr.getch()) != -1:
+            keys.append(key)
+        if not keys:
+            self.verify_input()
+        self.handle_keys(stdscr, keys)
+
+    def verify_task(self, task: asyncio.Task) -> None:
+        """Останавливает программу, если одна из сопрограмм завершилась с ошибкой."""
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error('Сопрограмма завершилась с ошибкой: %s', task.exception())
+            self.running = False
+
+    async def create_render_task(
+            self, stdscr, scheduler: TickScheduler, function, shown: asyncio.Event | None = None
+    ) -> None:
+        """
+        Сопрограмма отрисовки одного модуля по его расписанию. В режиме простоя рисуются только часы,
+        информация о системе при быстром запуске ждёт первого сбора данных. После первого кадра
+        устанавливается событие shown.
+        """
+        while self.running:
+            if function != self.display_digits and (self.idle or not self.verify_info_frame()):
+                await asyncio.sleep(1.0)
+                continue
+            self.power.add_wakeup()
+            remainder: float = scheduler.get_remainder()
+            if remainder:
+                await asyncio.sleep(remainder)
+            scheduler.mark_frame()
+            self.render_module(stdscr, function)
+            self.flush(stdscr)
+            if self.first_frame is None:
+                self.mark_first_frame()
+            if shown is not None:
+                shown.set()
+            await asyncio.sleep(scheduler.get_delay(self.fps))
+
+    async def create_periodic_task(self, name: str, function, interval, after: asyncio.Event | None = None) -> None:
+        """
+        Сопрограмма, выполняющая блокирующую функцию в пуле потоков раз в interval() секунд.
+        Если передано событие after, первый вызов откладывается до него. Ожидание прерывается досрочно
+        при выходе из режима простоя, как и у фоновых потоков.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self.task_events.append(wake)
+        try:
+            if after is not None:
+                await after.wait()
+            while self.running:
+                try:
+                    await loop.run_in_executor(None, function)
+                except Exception as e:
+                    self.logger.error('Ошибка в задаче «%s»: %s', name, e)
+                try:
+                    await asyncio.wait_for(wake.wait(), interval())
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+        finally:
+            self.task_events.remove(wake)
+
+    def set_idle(self, stdscr, idle: bool) -> None:
+        """При выходе из простоя, кроме фоновых потоков, будит и сопрограммы опроса датчиков и информации о системе."""
+        changed: bool = idle != self.idle
+        super().set_idle(stdscr, idle)
+        if changed and not idle:
+            for event in self.task_events:
+                event.set()
+
+    async def run_async(self, handlers: dict | None = None) -> None:
+        """
+        Запускает программу в текущем цикле событий и возвращает управление после остановки.
+        Обработчики сигналов из handlers (имя сигнала: функция(signum, frame)) регистрируются
+        через loop.add_signal_handler.
+        """
+        if not self.system_info and not self.clock and self.host_table is None:
+            raise self.NoThreadsError(self.message, self.verify_language(self.language))
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        signals: list[int] = []
+
+        def wake() -> None:
+            os.read(self.wake_pipe[0], 64)
+            if not self.running:
+                stop.set()
+
+        self.running = True
+        self.start_config_watcher()
+        self.start_timings_worker()
+        stdscr = self.open_screen()
+        self.wake_pipe = os.pipe()
+        loop.add_reader(self.wake_pipe[0], wake)
+        loop.add_reader(sys.stdin.fileno(), self.read_keys, stdscr)
+        if hasattr(signal, 'SIGWINCH'):
+            loop.add_signal_handler(signal.SIGWINCH, self.resize_screen, stdscr)
+            signals.append(signal.SIGWINCH)
+        for name, handler in (handlers or {}).items():
+            if hasattr(signal, name):
+                signum: int = getattr(signal, name)
+                loop.add_signal_handler(signum, handler, signum, None)
+                signals.append(signum)
+
+        self.init_curses(stdscr)
+        self.set_focus_reporting(True)
+        stdscr.nodelay(True)
+        shown = asyncio.Event()
+        after: asyncio.Event | None = shown if self.clock else None
+        self.info_pending = self.clock and self.system_info and self.host_table is None
+        coroutines: list = []
+        if self.clock:
+            coroutines.append(self.create_render_task(stdscr, self.clock_scheduler, self.display_digits, shown))
+        if self.system_info or self.host_table is not None:
+            coroutines.append(self.create_render_task(stdscr, self.info_scheduler, self.get_info_modules, shown))
+        collect: bool = (self.system_info or self.recorder is not None) and self.replayer is None
+        if collect and self.sensors_worker is None:
+            coroutines.append(self.create_periodic_task(
+                'sensors', self.update_temperature_info, self.get_sensor_interval, after
+            ))
+        if collect and self.system_info_worker is None:
+            coroutines.append(self.create_periodic_task(
+                'system-info', self.update_system_info, lambda: self.settings.system_info_ttl, after
+            ))
+        tasks: list[asyncio.Task] = [asyncio.create_task(coroutine) for coroutine in coroutines]
+        for task in tasks:
+            task.add_done_callback(self.verify_task)
+        try:
+            await stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.stop_timings_worker()
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+            loop.remove_reader(sys.stdin.fileno())
+            loop.remove_reader(self.wake_pipe[0])
+            pipe, self.wake_pipe = self.wake_pipe, None
+            os.close(pipe[0]), os.close(pipe[1])
+            self.set_focus_reporting(False)
+            self.close_screen(stdscr)
+            self.running = False
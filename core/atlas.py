@@ -0,0 +1,72 @@
+FONTS: dict[str, tuple[str, int, int]] = {
+    'large': ('digits', 2, 3),
+    'medium': ('digits_medium', 2, 2),
+    'small': ('digits_small', 1, 1)
+}
+SYMBOLS: tuple[str, ...] = (*'0123456789', 'points')
+
+
+class GlyphAtlas:
+    """
+    Атлас шрифта цифр, собранный один раз при загрузке файла. Пустые столбцы по краям символов обрезаются,
+    затем для всех чисел от 00 до 99 заранее составляются готовые строки пар цифр, поэтому строка времени
+    на кадр собирается сложением нескольких готовых кусков, а выводится по одной строке экрана на ряд шрифта.
+    """
+    __slots__ = ('name', 'height', 'pairs', 'points', 'margin', 'width', 'short_width')
+
+    def __init__(self, name: str, glyphs: dict[str, tuple[str, ...]], digit_gap: int, points_gap: int):
+        self.verify_glyphs(name, glyphs)
+        self.name = name
+        self.height: int = len(glyphs['0'])
+        digits: list[tuple[str, ...]] = self.trim([glyphs[digit] for digit in '0123456789'])
+        points: tuple[str, ...] = self.trim([glyphs['points']])[0]
+        between: str = ' ' * digit_gap
+        gap: str = ' ' * points_gap
+        self.margin: str = '  '
+        self.points: tuple[str, ...] = tuple(f'{gap}{row}{gap}' for row in points)
+        self.pairs: tuple[tuple[str, ...], ...] = tuple(
+            tuple(f'{digits[i // 10][row]}{between}{digits[i % 10][row]}' for row in range(self.height))
+            for i in range(100)
+        )
+        self.short_width: int = len(self.margin) + 2 * len(self.pairs[0][0]) + len(self.points[0])
+        self.width: int = self.short_width + len(self.points[0]) + len(self.pairs[0][0])
+
+    @staticmethod
+    def verify_glyphs(name: str, glyphs: dict) -> None:
+        """Проверяет файл шрифта: все цифры и разделитель, одинаковая высота, ширина строк внутри символа."""
+        missing: list[str] = [symbol for symbol in SYMBOLS if symbol not in glyphs]
+        if missing:
+            raise ValueError(f'В шрифте «{name}» нет символов: {", ".join(missing)}')
+        heights: set[int] = set()
+        for symbol in SYMBOLS:
+            rows = glyphs[symbol]
+            if not isinstance(rows, (list, tuple)) or not rows or not all(isinstance(row, str) for row in rows):
+                raise ValueError(f'Символ «{symbol}» шрифта «{name}» должен быть непустым списком строк')
+            if len({len(row) for row in rows}) != 1:
+                raise ValueError(f'Строки символа «{symbol}» шрифта «{name}» имеют разную ширину')
+            heights.add(len(rows))
+        if len(heights) != 1:
+            raise ValueError(f'Символы шрифта «{name}» имеют разную высоту: {sorted(heights)}')
+        if len({len(glyphs[digit][0]) for digit in '0123456789'}) != 1:
+            raise ValueError(f'Цифры шрифта «{name}» имеют разную ширину')
+
+    @staticmethod
+    def trim(glyphs: list[tuple[str, ...]]) -> list[tuple[str, ...]]:
+        """Обрезает столбцы, пустые во всех переданных символах, слева и справа."""
+        columns: list[int] = [
+            i for i in range(len(glyphs[0][0])) if any(row[i] != ' ' for glyph in glyphs for row in glyph)
+        ]
+        if not columns:
+            return glyphs
+        return [tuple(row[columns[0]:columns[-1] + 1] for row in glyph) for glyph in glyphs]
+
+    def compose(self, hours: int, minutes: int, seconds: int | None = None) -> list[str]:
+        """Возвращает готовые строки «ЧЧ:ММ:СС» или «ЧЧ:ММ», если секунды не переданы."""
+        hour_rows, minute_rows, points = self.pairs[hours], self.pairs[minutes], self.points
+        if seconds is None:
+            return [f'{self.margin}{hour_rows[i]}{points[i]}{minute_rows[i]}' for i in range(self.height)]
+        second_rows: tuple[str, ...] = self.pairs[seconds]
+        return [
+            f'{self.margin}{hour_rows[i]}{points[i]}{minute_rows[i]}{points[i]}{second_rows[i]}'
+            for i in range(self.height)
+        ]
@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+from .scheduler import TickScheduler
+from .temperature import TemperatureSnapshot
+
+SYSTEM_FIELDS: tuple[str, ...] = (
+    'login', 'node', 'system', 'release', 'architecture', 'machine', 'python', 'processor', 'ip'
+)
+TEMPERATURE_FIELDS: tuple[str, ...] = ('cpu', 'gpu', 'ram', 'storage', 'motherboard')
+
+
+class Sample(NamedTuple):
+    """Один отсчёт данных, общий для всех способов вывода."""
+    timestamp: float
+    info: tuple
+    sensors: TemperatureSnapshot
+
+    def as_dict(self) -> dict:
+        """Возвращает отсчёт в виде словаря для сериализации."""
+        temperature: dict[str, float | None] = dict(zip(TEMPERATURE_FIELDS, self.sensors.values))
+        temperature['average'] = self.sensors.average
+        temperature['smoothed'] = self.sensors.smoothed
+        return {
+            'time': datetime.fromtimestamp(self.timestamp).isoformat(timespec='seconds'),
+            'timestamp': self.timestamp,
+            'system': dict(zip(SYSTEM_FIELDS, self.info)),
+            'temperature': temperature
+        }
+
+
+class OutputBackend:
+    """Базовый способ вывода отсчётов без curses."""
+
+    def write(self, sample: Sample) -> None:
+        """Выводит отсчёт."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Освобождает ресурсы способа вывода."""
+
+
+class AnsiBackend(OutputBackend):
+    """
+    Выводит часы и информацию escape-последовательностями ANSI прямо в поток. Запоминает выведенные строки
+    и переписывает только изменившиеся.
+    """
+    basic_colors: dict[str, int] = {
+        'BLACK': 30, 'RED': 31, 'GREEN': 32, 'YELLOW': 33, 'BLUE': 34, 'MAGENTA': 35, 'CYAN': 36, 'WHITE': 37
+    }
+
+    def __init__(self, program, stream=None):
+        self.program = program
+        self.stream = stream or sys.stdout
+        self.lines: list[str] = []
+        self.stream.write('\x1b[?25l\x1b[2J')
+
+    @classmethod
+    def create_color(cls, color: str | int) -> str:
+        """Возвращает escape-последовательность цвета текста для названия, номера палитры или «#RRGGBB»."""
+        if isinstance(color, int):
+            return f'\x1b[38;5;{color}m'
+        if color.startswith('#'):
+            return f'\x1b[38;2;{int(color[1:3], 16)};{int(color[3:5], 16)};{int(color[5:7], 16)}m'
+        return f'\x1b[{cls.basic_colors.get(color.upper(), 37)}m'
+
+    def create_digits(self, timestamp: float) -> list[str]:
+        """Составляет строки цифр текущего времени шрифтом из настроек (large при автоматическом выборе)."""
+        font: str = self.program.settings.font
+        moment: datetime = datetime.fromtimestamp(timestamp)
+        return self.program.get_atlas('large' if font == 'auto' else font).compose(
+            moment.hour, moment.minute, moment.second
+        )
+
+    def create_lines(self, sample: Sample) -> list[str]:
+        """Составляет все строки экрана вместе с цветами."""
+        settings = self.program.settings
+        digits_color: str = self.create_color(settings.digits_color)
+        info_color: str = self.create_color(settings.system_info_color)
+        lines: list[str] = [f'{digits_color}{row}' for row in self.create_digits(sample.timestamp)]
+        if settings.system_info:
+            lines.append('')
+            lines += [f'{info_color}{line}' for line in self.program.get_info_list(self.program.create_system_info)]
+            lines += [
+                f'{info_color}{line}' for line in self.program.get_info_list(self.program.create_temperature_info)
+            ]
+        return lines
+
+    def write(self, sample: Sample) -> None:
+        """Переписывает только те строки, которые изменились с прошлого отсчёта."""
+        lines: list[str] = self.create_lines(sample)
+        output: list[str] = []
+        for row, line in enumerate(lines):
+            if row >= len(self.lines) or self.lines[row] != line:
+                output.append(f'\x1b[{row + 1};1H{line}\x1b[0m\x1b[K')
+        for row in range(len(lines), len(self.lines)):
+            output.append(f'\x1b[{row + 1};1H\x1b[K')
+        self.lines = lines
+        if output:
+            self.stream.write(''.join(output))
+            self.stream.flush()
+
+    def close(self) -> None:
+        """Возвращает курсор и переводит его под выведенные строки."""
+        self.stream.write(f'\x1b[0m\x1b[{len(self.lines) + 1};1H\x1b[?25h')
+        self.stream.flush()
+
+
+class JsonLinesBackend(OutputBackend):
+    """Выводит каждый отсчёт отдельной строкой json."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write(self, sample: Sample) -> None:
+        """Выводит отсчёт одной строкой."""
+        self.stream.write(json.dumps(sample.as_dict(), ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+
+class PrometheusBackend(OutputBackend):
+    """Записывает отсчёт в текстовом формате Prometheus, атомарно заменяя файл."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def escape_label(value) -> str:
+        """Экранирует значение метки по правилам формата Prometheus."""
+        return str(value if value is not None else '').replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    @classmethod
+    def create_text(cls, sample: Sample) -> str:
+        """Составляет текст метрик в формате Prometheus."""
+        lines: list[str] = [
+            '# HELP clock_temperature_celsius Current temperature of the component.',
+            '# TYPE clock_temperature_celsius gauge'
+        ]
+        for component, value in zip(TEMPERATURE_FIELDS, sample.sensors.values):
+            if value is not None:
+                lines.append(f'clock_temperature_celsius{{component="{component}"}} {value}')
+        for name, value, description in (
+                ('average', sample.sensors.average, 'Average temperature of all components.'),
+                ('smoothed', sample.sensors.smoothed, 'Average temperature smoothed over the history window.')
+        ):
+            if value is not None:
+                lines += [
+                    f'# HELP clock_temperature_{name}_celsius {description}',
+                    f'# TYPE clock_temperature_{name}_celsius gauge',
+                    f'clock_temperature_{name}_celsius {value}'
+                ]
+        labels: str = ','.join(
+            f'{name}="{cls.escape_label(value)}"' for name, value in zip(SYSTEM_FIELDS, sample.info)
+        )
+        lines += [
+            '# HELP clock_info System information of the host.',
+            '# TYPE clock_info gauge',
+            f'clock_info{{{labels}}} 1',
+            '# HELP clock_sample_timestamp_seconds Time of the sample.',
+            '# TYPE clock_sample_timestamp_seconds gauge',
+            f'clock_sample_timestamp_seconds {sample.timestamp:.3f}'
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, sample: Sample) -> None:
+        """Записывает метрики во временный файл и переименовывает его поверх основного."""
+        temporary_path: str = f'{self.path}.tmp'
+        with open(temporary_path, 'w', encoding='UTF-8') as file:
+            file.write(self.create_text(sample))
+        os.replace(temporary_path, self.path)
+
+
+class SamplePipeline:
+    """
+    Общий конвейер отсчётов: раз в интервал берёт готовые снимки у фоновых потоков программы
+    и передаёт один и тот же отсчёт всем способам вывода, поэтому новый способ не добавляет опросов.
+    """
+
+    def __init__(self, program, backends: list[OutputBackend]):
+        self.program = program
+        self.backends = backends
+        self.scheduler = TickScheduler(lambda: program.settings.info_interval, aligned=True)
+
+    def write(self, sample: Sample) -> None:
+        """Передаёт отсчёт всем способам вывода, ошибка одного не мешает остальным."""
+        for backend in self.backends:
+            try:
+                backend.write(sample)
+            except Exception as e:
+                self.program.logger.error('Ошибка вывода «%s»: %s', type(backend).__name__, e)
+
+    def run(self) -> None:
+        """Создаёт отсчёты по расписанию, пока программа не будет остановлена."""
+        try:
+            while self.program.running:
+                self.scheduler.settle()
+                self.write(self.program.create_sample())
+                self.program.stop_event.wait(self.scheduler.get_delay(self.program.fps))
+        finally:
+            for backend in self.backends:
+                backend.close()
@@ -1,13 +1,19 @@
 import os
-import platform
+import sys
+from threading import Lock
+from time import monotonic
 from logging import config, getLogger
 from json import load, dump, JSONDecodeError
 
+from .atlas import FONTS, GlyphAtlas
+from .profiling import Instrumentation
+from .settings import Settings, ConfigWatcher
+
 
 class Base:
     __slots__ = (
-        'logger', 'config', 'variables', 'digits_color', 'info_color',
-        'logo_color', 'clock', 'system_info', 'language', 'logo_name'
+        'logger', 'config', 'settings', 'settings_lock', 'config_watcher', 'reload_pending',
+        'glyphs', 'glyphs_lock', 'glyphs_stats', 'glyphs_check_interval', 'timings', 'idle', 'atlases'
     )
 
     def __init__(self):
@@ -19,19 +25,64 @@ class Base:
             "clock": True,
             "system_info": True,
             "language": "ru",
-            "logo_name": ""
+            "logo_name": "",
+            "config_watcher": "auto",
+            "config_poll_interval": 2.0,
+            "system_info_ttl": 60.0,
+            "dns_timeout": 2.0,
+            "sensor_interval": 2.0,
+            "sensor_backend": "auto",
+            "history_size": 30,
+            "sparkline": False,
+            "info_interval": 1.0,
+            "timings_log_interval": 300.0,
+            "dashboard_capacity": 1024,
+            "dashboard_ttl": 10.0,
+            "power_saving": False,
+            "idle_timeout": 0.0,
+            "idle_sensor_interval": 60.0,
+            "font": "auto",
+            "world_clock": []
         }
-        self.variables = self.get_config_data('config')
-        try:
-            self.digits_color = self.variables['digits_color']
-            self.info_color = self.variables['system_info_color']
-            self.logo_color = self.variables['logo_color']
-            self.clock = self.variables['clock']
-            self.system_info = self.variables['system_info']
-            self.language = self.variables['language']
-            self.logo_name = self.variables['logo_name']
-        except TypeError:
-            print('\nTypeError! Переменные не могут быть инициализированы!')
+        self.timings = Instrumentation()
+        self.idle: bool = False
+        self.glyphs: dict[str, tuple[float, tuple[int, int] | None, dict[str, tuple[str, ...]]]] = {}
+        self.glyphs_lock = Lock()
+        self.glyphs_stats: dict[str, int] = {'hits': 0, 'misses': 0, 'reloads': 0}
+        self.glyphs_check_interval: float = 1.0
+        self.atlases: dict[str, tuple[dict | None, GlyphAtlas]] = {}
+        self.settings_lock = Lock()
+        self.config_watcher: ConfigWatcher | None = None
+        self.reload_pending: bool = False
+        self.settings: Settings = self.load_settings()
+
+    @property
+    def digits_color(self) -> str:
+        return self.settings.digits_color
+
+    @property
+    def info_color(self) -> str:
+        return self.settings.system_info_color
+
+    @property
+    def logo_color(self) -> str:
+        return self.settings.logo_color
+
+    @property
+    def clock(self) -> bool:
+        return self.settings.clock
+
+    @property
+    def system_info(self) -> bool:
+        return self.settings.system_info
+
+    @property
+    def language(self) -> str:
+        return self.settings.language
+
+    @property
+    def logo_name(self) -> str:
+        return self.settings.logo_name
 
     @staticmethod
     def create_directories() -> None:
@@ -52,13 +103,12 @@ class Base:
 
     @staticmethod
     def verify_os() -> str | None:
-        """Метод проверяет на какой ОС запускается программа."""
-        system: str = platform.system()
-        if system == 'Linux':
+        """Метод проверяет на какой ОС запускается программа, не импортируя модуль platform."""
+        if sys.platform.startswith('linux'):
             return 'Linux'
-        if system == 'Darwin':
+        if sys.platform == 'darwin':
             return 'macOS'
-        if system == 'Windows':
+        if sys.platform == 'win32':
             return 'Windows'
         return None
 
@@ -107,6 +157,137 @@ class Base:
             print(f'\nOSError! Не удалось прочитать файл «{config_name}.json» из-за {e}')
             return None
 
+    @staticmethod
+    def get_file_signature(file_path: str) -> tuple[int, int] | None:
+        """Возвращает время изменения и размер файла или None, если файл недоступен."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get_glyphs(self, name: str) -> dict[str, tuple[str, ...]]:
+        """Возвращает изображения символов, измеряя время обращения к кэшу."""
+        with self.timings.measure('glyphs'):
+            return self.load_glyphs(name)
+
+    def load_glyphs(self, name: str) -> dict[str, tuple[str, ...]]:
+        """
+        Возвращает изображения символов из кэша, перечитывая json-файл только при изменении его
+        времени модификации или размера. Файл проверяется не чаще, чем раз в glyphs_check_interval секунд.
+        """
+        cached = self.glyphs.get(name)
+        now: float = monotonic()
+        if cached is not None and now - cached[0] < self.glyphs_check_interval:
+            self.glyphs_stats['hits'] += 1
+            return cached[2]
+        with self.glyphs_lock:
+            cached = self.glyphs.get(name)
+            signature = self.get_file_signature(os.path.join('config_files', f'{name}.json'))
+            if cached is not None and cached[1] == signature:
+                self.glyphs[name] = (now, signature, cached[2])
+                self.glyphs_stats['hits'] += 1
+                return cached[2]
+            data: dict[str, tuple[str, ...]] = {
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in self.get_json_data('config_files', name).items()
+            }
+            self.glyphs[name] = (now, signature, data)
+            self.glyphs_stats['misses' if cached is None else 'reloads'] += 1
+            return data
+
+    def get_atlas(self, font: str) -> GlyphAtlas:
+        """
+        Возвращает атлас шрифта цифр, пересобирая его только при перечитывании файла шрифта. Файл проверяется
+        при сборке атласа; если дополнительный шрифт отсутствует или некорректен, используется large
+        до следующего сброса кэша.
+        """
+        file_name, digit_gap, points_gap = FONTS[font]
+        cached = self.atlases.get(font)
+        if cached is not None and cached[0] is None:
+            return cached[1]
+        try:
+            glyphs: dict[str, tuple[str, ...]] = self.get_glyphs(file_name)
+            if cached is not None and cached[0] is glyphs:
+                return cached[1]
+            atlas: GlyphAtlas = GlyphAtlas(font, glyphs, digit_gap, points_gap)
+        except (ValueError, OSError) as e:
+            if font == 'large':
+                raise
+            self.logger.error('Шрифт «%s» не загружен: %s. Используется шрифт large.', font, e)
+            glyphs, atlas = None, self.get_atlas('large')
+        self.atlases[font] = (glyphs, atlas)
+        return atlas
+
+    def invalidate_glyphs(self) -> None:
+        """Сбрасывает кэш изображений символов и атласы шрифтов, следующее обращение перечитает файлы."""
+        with self.glyphs_lock:
+            self.glyphs = {name: (float('-inf'), None, data) for name, (_, _, data) in self.glyphs.items()}
+            self.atlases = {}
+        self.logger.info('Кэш изображений символов сброшен, статистика: %s', self.glyphs_stats)
+
+    def read_settings(self, version: int) -> Settings:
+        """Читает и проверяет файл конфигурации, при ошибке выбрасывает ValueError."""
+        try:
+            data: dict | None = self.get_config_data('config')
+        except (ValueError, PermissionError) as e:
+            raise ValueError(str(e))
+        return Settings.from_dict(data, self.config, version)
+
+    def load_settings(self) -> Settings:
+        """Загружает первый снимок конфигурации, при ошибке используются настройки по умолчанию."""
+        try:
+            return self.read_settings(1)
+        except ValueError as e:
+            print(f'\nValueError! Файл «config.json» содержит ошибку, применены настройки по умолчанию: {e}')
+            return Settings.from_dict(self.config, self.config, 1)
+
+    def reload_settings(self) -> bool:
+        """
+        Перечитывает конфигурацию и атомарно подменяет снимок, увеличивая номер версии.
+        Если файл содержит ошибку или не изменился, текущий снимок остаётся в силе.
+        """
+        with self.settings_lock, self.timings.measure('config'):
+            current: Settings = self.settings
+            try:
+                settings: Settings = self.read_settings(current.version + 1)
+            except ValueError as e:
+                self.logger.error('Конфигурация не перезагружена, оставлена версия %d: %s', current.version, e)
+                return False
+            if settings.same_values(current):
+                return False
+            self.settings = settings
+        self.logger.info('Конфигурация перезагружена, версия %d.', settings.version)
+        return True
+
+    def request_reload(self) -> None:
+        """
+        Отмечает запрос сброса кэша изображений и перечитывания конфигурации. Метод только ставит флаг,
+        поэтому его можно вызывать из обработчика сигнала: сам сброс выполняет поток наблюдения за конфигурацией.
+        """
+        self.reload_pending = True
+
+    def apply_reload(self) -> None:
+        """Выполняет отложенный запрос перезагрузки, если он был."""
+        if not self.reload_pending:
+            return None
+        self.reload_pending = False
+        self.invalidate_glyphs()
+        self.reload_settings()
+        return None
+
+    def start_config_watcher(self) -> None:
+        """Запускает фоновое наблюдение за файлом конфигурации."""
+        if self.config_watcher is None:
+            self.config_watcher = ConfigWatcher(self, 'config_files', 'config', self.reload_settings)
+            self.config_watcher.start()
+
+    def stop_config_watcher(self) -> None:
+        """Останавливает наблюдение за файлом конфигурации."""
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+            self.config_watcher = None
+
     def get_logging_data(self) -> None:
         """Загружает и применяет конфигурацию логирования из JSON-файла."""
         config.dictConfig(self.get_json_data('config_files/logs', 'logging'))
@@ -1,22 +1,78 @@
-from datetime import datetime
+from time import localtime
+from typing import TYPE_CHECKING
 
 from .visualisation import Visualisation
 
+if TYPE_CHECKING:
+    from .worldclock import WorldClock
+
 
 class Clock(Visualisation):
+    panel_width: int = 30
+
+    def __init__(self):
+        super().__init__()
+        self.world_clock: WorldClock | None = None
+
+    def get_world_clock(self, stdscr) -> 'WorldClock':
+        """
+        Метод возвращает часовые пояса панелей мирового времени, пересоздавая их при изменении списка в настройках.
+        Модуль zoneinfo импортируется только при первом включении панелей.
+        """
+        names: tuple[str, ...] = self.settings.world_clock
+        if self.world_clock is None or self.world_clock.names != names:
+            from .worldclock import WorldClock
+            if self.world_clock is not None:
+                stdscr.clear()
+                self.invalidate_frame()
+            self.world_clock = WorldClock(names)
+            if self.world_clock.missing:
+                self.logger.error('Часовые пояса не найдены: %s', ', '.join(self.world_clock.missing))
+        return self.world_clock
+
+    def display_world_clock(self, stdscr, timestamp: float, y: int) -> None:
+        """
+        Метод рисует под цифрами панели мирового времени мелким шрифтом, столько, сколько помещается на экране.
+        Время всех панелей вычисляется из того же отсчёта timestamp, что и основные цифры.
+        """
+        world_clock: WorldClock = self.get_world_clock(stdscr)
+        if not world_clock.names:
+            return None
+        layout = self.layout
+        atlas = self.get_atlas('small')
+        step: int = atlas.height + 1
+        columns: int = max(1, layout.width // self.panel_width)
+        count: int = max(0, (layout.height - y) // step) * columns
+        label_color: int = self.paint(self.settings.system_info_color, False)
+        digits_color: int = self.paint(self.settings.digits_color, False)
+        label_width: int = self.panel_width - len(atlas.margin) - 1
+        for i, (label, seconds) in enumerate(world_clock.sample(timestamp)[:count]):
+            panel_y, x = y + i // columns * step, i % columns * self.panel_width
+            self.draw(stdscr, panel_y, x + len(atlas.margin), f'{label:<{label_width}.{label_width}}', label_color)
+            if seconds is None:
+                self.draw(stdscr, panel_y + 1, x + len(atlas.margin), self.error_emoji, label_color)
+                continue
+            data: list[str] = atlas.compose(seconds // 3600, seconds // 60 % 60, seconds % 60)
+            self.display_symbols(stdscr, atlas.height, panel_y + 1, x, data, digits_color)
+        return None
 
     def display_digits(self, stdscr) -> None:
-        """Метод отображает текстовые изображения цифр текущего времени на экране."""
-        color: int = self.paint(self.digits_color, False)
-        digits_height = lambda: self.dgts_y if self.system_info else self.dgts_y - 12
-        y: int = digits_height()
-        x: tuple[tuple[int, int, int], tuple[int, int, int], tuple[int, int, int]] = self.dgts_x
-
-        data: dict[str, str | bool] = self.get_json_data('config_files', 'digits')
-        current_time: tuple = f'{datetime.now():%H}', f'{datetime.now():%M}', f'{datetime.now():%S}'
-
-        for i in range(3):
-            self.display_symbols(stdscr, len(data), y, x[i - 1][0], data[current_time[i - 1][0]], color)
-            self.display_symbols(stdscr, len(data), y, x[i - 1][1], data[current_time[i - 1][1]], color)
-            if i == 1 or i == 2:
-                self.display_symbols(stdscr, len(data), y, x[i - 1][2], data['points'], color)
+        """
+        Метод отображает цифры текущего времени шрифтом из раскладки: строки «ЧЧ:ММ:СС» собираются из готовых
+        пар цифр атласа и выводятся по одной на ряд шрифта. Время берётся один раз на кадр, из этого же
+        отсчёта рисуются панели мирового времени.
+        """
+        settings = self.settings
+        if self.layout.font_setting != settings.font:
+            stdscr.clear()
+            self.apply_layout(stdscr)
+        layout = self.layout
+        color: int = self.paint(settings.digits_color, False)
+        y: int = self.get_digits_y()
+        atlas = self.get_atlas(layout.font)
+        timestamp: float = self.get_frame_time()
+        now = localtime(timestamp)
+        data: list[str] = atlas.compose(now.tm_hour, now.tm_min, now.tm_sec if layout.seconds else None)
+        self.display_symbols(stdscr, atlas.height, y, self.dgts_x[0][0], data, color)
+        if settings.world_clock or self.world_clock is not None:
+            self.display_world_clock(stdscr, timestamp, y + atlas.height + 1)
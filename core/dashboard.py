@@ -0,0 +1,72 @@
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from .visualisation import Visualisation
+from .settings import COLORS
+
+if TYPE_CHECKING:
+    from .aggregator import HostTable, HostReading, AggregatorReceiver
+
+
+class Dashboard(Visualisation):
+    cell_width: int = 30
+
+    def __init__(self):
+        super().__init__()
+        self.host_table: HostTable | None = None
+        self.aggregator: AggregatorReceiver | None = None
+
+    def start_aggregator(self, address: str) -> None:
+        """
+        Метод запускает приём показаний других хостов, после чего вместо информации о системе рисуется стойка.
+        Модуль сокетов импортируется только здесь, чтобы не замедлять запуск обычных часов.
+        """
+        if self.aggregator is None:
+            from .aggregator import HostTable, AggregatorReceiver
+            self.host_table = HostTable(self.settings.dashboard_capacity, lambda: self.settings.dashboard_ttl)
+            self.aggregator = AggregatorReceiver(address, self.host_table)
+            self.aggregator.start()
+            self.logger.info('Приём показаний хостов запущен на %s.', address)
+
+    def stop_aggregator(self) -> None:
+        """Метод останавливает приём показаний других хостов."""
+        if self.aggregator is not None:
+            self.aggregator.close()
+            self.aggregator = None
+
+    @staticmethod
+    def get_level(temperature: float | None) -> int:
+        """Метод возвращает номер цвета уровня температуры по тем же границам, что и у индикатора, 6 без данных."""
+        if temperature is None:
+            return 6
+        return min(5, max(0, int(temperature - 35) // 5))
+
+    def create_cell(self, reading: 'HostReading | None', now: float) -> str:
+        """Метод составляет ячейку стойки: имя хоста, средняя температура и возраст показаний."""
+        if reading is None:
+            return ' ' * self.cell_width
+        average: str = f'{reading.average:.1f}°C' if reading.average is not None else '--'
+        return f'{reading.host:<16.16}{average:>8}{int(now - reading.received):>4}s '
+
+    def display_dashboard(self, stdscr) -> None:
+        """
+        Метод рисует стойку вместо информации о системе: заголовок со счётчиками и сетку самых горячих хостов,
+        сколько помещается над цифрами часов (или на всём экране, если часы отключены), по столбцам сверху вниз.
+        """
+        table: HostTable = self.host_table
+        width: int = self.layout.width
+        bottom: int = self.get_digits_y() if self.clock else self.layout.height + 1
+        rows: int = max(0, bottom - 2)
+        columns: int = max(1, width // self.cell_width)
+        readings: list[HostReading] = table.get_hottest(rows * columns)
+        now: float = monotonic()
+        color: int = self.paint(self.settings.system_info_color, False)
+        header: str = (
+            f'hosts {len(table)}  received {self.aggregator.received}  invalid {self.aggregator.invalid}  '
+            f'evicted {table.evicted}'
+        )
+        self.draw(stdscr, 0, 0, f'{header:<{columns * self.cell_width}}', color)
+        for i in range(rows * columns):
+            reading: HostReading | None = readings[i] if i < len(readings) else None
+            cell_color: int = color if reading is None else self.paint(COLORS[self.get_level(reading.average)], False)
+            self.draw(stdscr, 1 + i % rows, (i // rows) * self.cell_width, self.create_cell(reading, now), cell_color)
@@ -0,0 +1,71 @@
+from array import array
+
+
+class RingBuffer:
+    """
+    Кольцевой буфер фиксированного размера на массиве array с O(1) скользящими средним, минимумом и максимумом.
+    Минимум и максимум поддерживаются монотонными очередями номеров отсчётов, которые тоже хранятся
+    в заранее выделенных массивах, поэтому добавление значения не создаёт новых контейнеров.
+    """
+    __slots__ = ('size', 'samples', 'total', 'sequence', 'maximums', 'max_head', 'max_tail',
+                 'minimums', 'min_head', 'min_tail')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.samples = array('d', bytes(8 * size))
+        self.total: float = 0.0
+        self.sequence: int = 0
+        self.maximums = array('q', bytes(8 * size))
+        self.max_head: int = 0
+        self.max_tail: int = 0
+        self.minimums = array('q', bytes(8 * size))
+        self.min_head: int = 0
+        self.min_tail: int = 0
+
+    def __len__(self) -> int:
+        return min(self.sequence, self.size)
+
+    def push(self, value: float) -> None:
+        """Добавляет значение, вытесняя самое старое при заполненном буфере."""
+        size, sequence, samples = self.size, self.sequence, self.samples
+        slot: int = sequence % size
+        if sequence >= size:
+            self.total -= samples[slot]
+        samples[slot] = value
+        self.total += value
+        self.sequence = sequence + 1
+
+        expired: int = sequence - size
+        maximums, head, tail = self.maximums, self.max_head, self.max_tail
+        while head < tail and maximums[head % size] <= expired:
+            head += 1
+        while head < tail and samples[maximums[(tail - 1) % size] % size] <= value:
+            tail -= 1
+        maximums[tail % size] = sequence
+        self.max_head, self.max_tail = head, tail + 1
+
+        minimums, head, tail = self.minimums, self.min_head, self.min_tail
+        while head < tail and minimums[head % size] <= expired:
+            head += 1
+        while head < tail and samples[minimums[(tail - 1) % size] % size] >= value:
+            tail -= 1
+        minimums[tail % size] = sequence
+        self.min_head, self.min_tail = head, tail + 1
+
+    def mean(self) -> float | None:
+        """Возвращает среднее значение по буферу."""
+        count: int = len(self)
+        return self.total / count if count else None
+
+    def maximum(self) -> float | None:
+        """Возвращает максимальное значение в буфере."""
+        return self.samples[self.maximums[self.max_head % self.size] % self.size] if self.sequence else None
+
+    def minimum(self) -> float | None:
+        """Возвращает минимальное значение в буфере."""
+        return self.samples[self.minimums[self.min_head % self.size] % self.size] if self.sequence else None
+
+    def last(self, count: int) -> list[float]:
+        """Возвращает не более count последних значений от старых к новым."""
+        count = min(count, len(self))
+        return [self.samples[i % self.size] for i in range(self.sequence - count, self.sequence)]
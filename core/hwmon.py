@@ -0,0 +1,114 @@
+import os
+
+
+class HwmonReader:
+    """
+    Читает температуру напрямую из sysfs. Каталоги hwmon просматриваются один раз при создании,
+    файлы temp*_input нужных устройств остаются открытыми и перечитываются через os.preadv
+    в заранее выделенный буфер. Разовая ошибка чтения (EIO или ENODATA у уснувшего устройства) даёт
+    пропуск одного показания; файл закрывается и ищется заново только после max_failures ошибок подряд.
+    """
+    __slots__ = ('root', 'names', 'buffer', 'handles', 'failures', 'lost', 'max_failures')
+
+    def __init__(self, names: tuple[str, ...], root: str = '/sys/class/hwmon', max_failures: int = 3):
+        self.root = root
+        self.names = names
+        self.buffer = bytearray(32)
+        self.failures: dict[str, int] = {}
+        self.lost: set[str] = set()
+        self.max_failures = max_failures
+        self.handles: dict[str, int] = self.discover(names)
+
+    @staticmethod
+    def read_text(path: str) -> str | None:
+        """Возвращает содержимое небольшого текстового файла sysfs или None, если его нельзя прочитать."""
+        try:
+            with open(path, encoding='UTF-8') as file:
+                return file.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def find_input(directory: str) -> str | None:
+        """Возвращает путь к файлу temp*_input с наименьшим номером, как первый датчик в psutil."""
+        try:
+            entries: list[str] = os.listdir(directory)
+        except OSError:
+            return None
+        inputs: list[tuple[int, str]] = []
+        for entry in entries:
+            if entry.startswith('temp') and entry.endswith('_input') and entry[4:-6].isdigit():
+                inputs.append((int(entry[4:-6]), entry))
+        return os.path.join(directory, min(inputs)[1]) if inputs else None
+
+    def discover(self, names: tuple[str, ...] | set[str]) -> dict[str, int]:
+        """Находит устройства с именами из names и открывает их первые файлы температуры."""
+        handles: dict[str, int] = {}
+        try:
+            entries: list[str] = sorted(os.listdir(self.root))
+        except OSError:
+            return handles
+        for entry in entries:
+            directory: str = os.path.join(self.root, entry)
+            name: str | None = self.read_text(os.path.join(directory, 'name'))
+            if name not in names or name in handles:
+                continue
+            path: str | None = self.find_input(directory)
+            if path is None:
+                continue
+            try:
+                handles[name] = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+        return handles
+
+    def read_value(self, fd: int) -> float | None:
+        """Перечитывает файл температуры с начала и переводит миллиградусы в градусы."""
+        size: int = os.preadv(fd, [self.buffer], 0)
+        try:
+            return int(self.buffer[:size]) / 1000
+        except ValueError:
+            return None
+
+    def drop(self, name: str) -> None:
+        """Закрывает файл устройства, которое не читается несколько раз подряд, чтобы найти его заново."""
+        try:
+            os.close(self.handles.pop(name))
+        except OSError:
+            pass
+        self.failures.pop(name, None)
+        self.lost.add(name)
+
+    def read(self) -> dict[str, float]:
+        """
+        Возвращает текущую температуру каждого найденного устройства. Устройство с ошибкой чтения
+        пропускается, а закрытые после повторных ошибок устройства перед чтением ищутся заново.
+        """
+        if self.lost:
+            found: dict[str, int] = self.discover(self.lost)
+            self.handles.update(found)
+            self.lost.difference_update(found)
+        sensors: dict[str, float] = {}
+        for name, fd in tuple(self.handles.items()):
+            try:
+                value: float | None = self.read_value(fd)
+            except OSError:
+                self.failures[name] = self.failures.get(name, 0) + 1
+                if self.failures[name] >= self.max_failures:
+                    self.drop(name)
+                continue
+            if self.failures:
+                self.failures.pop(name, None)
+            if value is not None:
+                sensors[name] = value
+        return sensors
+
+    def close(self) -> None:
+        """Закрывает все открытые файлы температуры."""
+        for fd in self.handles.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.handles.clear()
+        self.lost.clear()
@@ -1,69 +1,139 @@
 import os
-import socket
-import getpass
-import platform
+from threading import Thread
 
-from .visualisation import error, Visualisation
+from .workers import PeriodicWorker
+from .visualisation import Visualisation
 
 
 class Info(Visualisation):
 
     def __init__(self):
         super().__init__()
-        self.info = self.get_system_info()
+        self.static_info: tuple[str, str, str, str, str, str] | None = None
+        self.info: tuple = (None,) * 9
+        self.resolver: Thread | None = None
+        self.system_info_worker: PeriodicWorker | None = None
 
-    def get_system_info(self) -> tuple[str, str, str, str, str, str, str, str, str]:
-        """Метод получает информацию о системе."""
+    @staticmethod
+    def get_static_info() -> tuple[str, str, str, str, str, str]:
+        """Метод получает неизменную за время работы программы информацию о системе."""
+        import platform
+        system: str = platform.system()
+        release: str = platform.release()
+        architecture: str = platform.architecture()[0]
+        machine: str = platform.machine()
+        version_python: str = platform.python_version()
+        processor: str = platform.processor()
+        return system, release, architecture, machine, version_python, processor
+
+    def get_login(self) -> str:
+        """Метод получает имя пользователя."""
+        import getpass
         try:
-            login = getpass.getuser()
+            return getpass.getuser()
         except Exception:
             try:
                 if self.verify_os() != 'Windows':
                     import pwd
-                    login = pwd.getpwuid(os.geteuid()).pw_name
-                else:
-                    login = os.getlogin()
+                    return pwd.getpwuid(os.geteuid()).pw_name
+                return os.getlogin()
             except Exception:
-                login = 'user'
+                return 'user'
 
+    def resolve_host(self, node: str, timeout: float) -> str | None | bool:
+        """
+        Метод определяет IP-адрес узла в отдельном потоке и ждёт не дольше timeout секунд.
+        Возвращает False, если ответ не получен вовремя или предыдущий запрос ещё не завершён.
+        """
+        if self.resolver is not None and self.resolver.is_alive():
+            return False
+        import socket
+        result: list[str | None] = []
+
+        def target() -> None:
+            try:
+                result.append(socket.gethostbyname(node))
+            except OSError:
+                result.append(None)
+
+        self.resolver = Thread(target=target, name='dns-resolver', daemon=True)
+        self.resolver.start()
+        self.resolver.join(timeout)
+        return result[0] if result else False
+
+    def get_system_info(self) -> tuple[str, str, str, str, str, str, str, str, str | None]:
+        """Метод получает информацию о системе, обновляя только изменяемые поля."""
+        import platform
+        login: str = self.get_login()
         node: str = platform.node()
-        system: str = platform.system()
-        release: str = platform.release()
-        architecture: str = platform.architecture()[0]
-        machine: str = platform.machine()
-        version_python: str = platform.python_version()
-        processor: str = platform.processor()
-        host_by_name = socket.gethostbyname(node)
+        host_by_name = self.resolve_host(node, self.settings.dns_timeout)
+        if host_by_name is False:
+            host_by_name = self.info[8] if self.info[1] == node else None
+        return login, node, *self.static_info, host_by_name
+
+    def update_system_info(self) -> None:
+        """
+        Метод обновляет кэш информации о системе одним присваиванием. В режиме простоя сбор приостановлен.
+        Неизменная информация собирается при первом вызове из фонового потока и сразу публикуется вместе
+        с именами пользователя и узла, не дожидаясь ответа DNS.
+        """
+        if self.idle:
+            return None
+        with self.timings.measure('sysinfo'):
+            if self.static_info is None:
+                import platform
+                self.static_info = self.get_static_info()
+                self.info = (self.get_login(), platform.node(), *self.static_info, None)
+            self.info = self.get_system_info()
+        return None
+
+    def start_system_info_worker(self) -> None:
+        """Метод запускает фоновое обновление информации о системе раз в system_info_ttl секунд."""
+        if self.system_info_worker is None:
+            self.system_info_worker = PeriodicWorker(
+                'system-info', self.update_system_info, lambda: self.settings.system_info_ttl
+            )
+            self.system_info_worker.start()
 
-        return login, node, system, release, architecture, machine, version_python, processor, host_by_name
+    def stop_system_info_worker(self) -> None:
+        """Метод останавливает фоновое обновление информации о системе."""
+        if self.system_info_worker is not None:
+            self.system_info_worker.stop()
+            self.system_info_worker = None
 
     def display_logo(self, stdscr) -> None:
-        """Метод получает и отображает логотип на экране."""
-        logos: dict[str, str | bool] = self.get_json_data('config_files', 'logos')
+        """Метод получает и отображает логотип на экране, если он есть в текущей раскладке."""
+        if 'logo' in self.layout.hidden:
+            return None
+        settings = self.settings
+        logos: dict[str, tuple[str, ...]] = self.get_glyphs('logos')
         try:
-            data: str | bool = logos[self.logo_name if self.logo_name != '' else self.verify_os()]
+            data: tuple[str, ...] = logos[settings.logo_name if settings.logo_name != '' else self.verify_os()]
             self.display_symbols(
-                stdscr, len(data), self.logo_y, self.logo_x, data, self.paint(self.logo_color, False)
+                stdscr, len(data), self.logo_y, self.logo_x, data, self.paint(settings.logo_color, False)
             )
         except KeyError:
-            try:
-                stdscr.addstr(
-                    self.logo_y + 6, self.logo_x + 11, self.error_emoji, self.paint(self.logo_color, False)
-                )
-            except error:
-                pass
+            self.draw(
+                stdscr, self.logo_y + 6, self.logo_x + 11, self.error_emoji, self.paint(settings.logo_color, False)
+            )
+        return None
 
     def display_info(self, stdscr) -> None:
         """Метод отображает название проекта на экране."""
-        try:
-            name: str = f'{self.format_date()} | ЭЛЕКТРОНИКА 54'
-            version: str = 'Clock (version 1.0.9)'
-            copy_right: str = 'MIT License, (c) 2026 Joerdon Fryeman'
-            stdscr.addstr(self.name_y, self.name_x, name, self.paint(self.digits_color, False))
-            stdscr.addstr(self.version_y, self.version_x, version, self.paint(self.info_color, False))
-            stdscr.addstr(self.copy_right_y, self.copy_right_x, copy_right, self.paint(self.info_color, False))
-        except error:
-            pass
+        name: str = f'{self.format_date(self.get_frame_time())} | ЭЛЕКТРОНИКА 54'
+        version: str = 'Clock (version 1.0.9)'
+        copy_right: str = 'MIT License, (c) 2026 Joerdon Fryeman'
+        settings = self.settings
+        self.draw(stdscr, self.name_y, self.name_x, name, self.paint(settings.digits_color, False))
+        hidden: frozenset[str] = self.layout.hidden
+        if 'version' not in hidden:
+            self.draw(
+                stdscr, self.version_y, self.version_x, version, self.paint(settings.system_info_color, False)
+            )
+        if 'copy_right' not in hidden:
+            self.draw(
+                stdscr, self.copy_right_y, self.copy_right_x, copy_right, self.paint(settings.system_info_color, False)
+            )
 
     def verify_info(self, info: str, max_length: int = 16) -> str:
         """Метод проверяет и обрезает информацию до заданной длины."""
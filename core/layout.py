@@ -0,0 +1,61 @@
+from typing import NamedTuple
+
+from .atlas import GlyphAtlas
+
+POSITIONS: tuple[str, ...] = (
+    'logo_y', 'logo_x', 'name_y', 'name_x', 'info_y', 'info_x', 'temp_y', 'temp_x', 'version_y', 'version_x',
+    'copy_right_y', 'copy_right_x', 'idct_y', 'idct_x', 'dgts_y', 'dgts_x', 'spark_y', 'spark_x'
+)
+COMPACT_POSITIONS: dict[str, int | tuple] = {
+    'logo_y': 0, 'logo_x': 0, 'name_y': 0, 'name_x': 0, 'info_y': 1, 'info_x': 0, 'temp_y': 1, 'temp_x': 32,
+    'version_y': 0, 'version_x': 0, 'copy_right_y': 0, 'copy_right_x': 0, 'idct_y': 8, 'idct_x': 32,
+    'dgts_y': 12, 'dgts_x': ((0, 16, 33), (38, 54, 71), (76, 92, 71)), 'spark_y': 9, 'spark_x': 32
+}
+
+
+class Layout(NamedTuple):
+    """
+    Готовая раскладка экрана для текущего размера терминала: координаты модулей, скрытые модули, шрифт цифр
+    и ширина каждой строки, до которой обрезается вывод, чтобы не выходить за границы экрана.
+    """
+    name: str
+    height: int
+    width: int
+    positions: dict[str, int | tuple]
+    hidden: frozenset[str]
+    font: str
+    font_setting: str
+    seconds: bool
+    row_widths: tuple[int, ...]
+
+
+def choose_font(height: int, width: int, top: int, x: int, atlases: list[GlyphAtlas]) -> tuple[GlyphAtlas, bool]:
+    """Выбирает самый крупный шрифт, который помещается с секундами, затем без них, иначе самый мелкий."""
+    for atlas in atlases:
+        if top + atlas.height <= height and x + atlas.width <= width:
+            return atlas, True
+    for atlas in atlases:
+        if top + atlas.height <= height and x + atlas.short_width <= width:
+            return atlas, False
+    return atlases[-1], False
+
+
+def create_layout(
+        height: int, width: int, positions: dict[str, int | tuple], system_info: bool, atlases: list[GlyphAtlas],
+        font_setting: str = 'auto'
+) -> Layout:
+    """
+    Выбирает раскладку под размер терминала. Полной раскладке нужна ширина до конца секунд крупного шрифта
+    и высота до низа цифр самого мелкого из допустимых шрифтов. На более узких или низких терминалах выбирается
+    компактная: без логотипа и версии, информация и температура стоят рядом, цифры сразу под ними.
+    Шрифт цифр из atlases (от крупного к мелкому) подбирается под оставшееся место.
+    """
+    shift: int = 0 if system_info else 12
+    if width >= positions['dgts_x'][2][1] + 18 and height >= positions['dgts_y'] - shift + atlases[-1].height:
+        name, chosen, hidden = 'full', positions, frozenset()
+    else:
+        name, chosen = 'compact', COMPACT_POSITIONS
+        hidden = frozenset(('logo', 'version', 'copy_right'))
+    atlas, seconds = choose_font(height, width, chosen['dgts_y'] - shift, chosen['dgts_x'][0][0], atlases)
+    row_widths: tuple[int, ...] = tuple(width - (y == height - 1) for y in range(height))
+    return Layout(name, height, width, chosen, hidden, atlas.name, font_setting, seconds, row_widths)
@@ -0,0 +1,62 @@
+from time import monotonic, process_time
+
+FOCUS_IN: tuple[int, int, int] = (27, ord('['), ord('I'))
+FOCUS_OUT: tuple[int, int, int] = (27, ord('['), ord('O'))
+
+
+class PowerMonitor:
+    """
+    Считает пробуждения потока отрисовки и процессорное время процесса, раз в секунду пересчитывая их
+    в пробуждения в секунду и долю одного ядра, а также хранит время последнего ввода и фокус терминала.
+    """
+    __slots__ = (
+        'wakeups', 'wakeups_total', 'cpu_start', 'start', 'wakeups_per_second', 'cpu_share', 'last_input', 'focused'
+    )
+
+    def __init__(self):
+        self.wakeups: int = 0
+        self.wakeups_total: int = 0
+        self.start: float = monotonic()
+        self.cpu_start: float = process_time()
+        self.wakeups_per_second: float = 0.0
+        self.cpu_share: float = 0.0
+        self.last_input: float = self.start
+        self.focused: bool = True
+
+    def add_wakeup(self) -> None:
+        """Отмечает пробуждение и раз в секунду пересчитывает средние значения."""
+        self.wakeups += 1
+        now: float = monotonic()
+        elapsed: float = now - self.start
+        if elapsed >= 1.0:
+            cpu: float = process_time()
+            self.wakeups_total += self.wakeups
+            self.wakeups_per_second = self.wakeups / elapsed
+            self.cpu_share = (cpu - self.cpu_start) / elapsed
+            self.wakeups = 0
+            self.start, self.cpu_start = now, cpu
+
+    def get_idle_time(self) -> float:
+        """Возвращает время с последнего нажатия клавиши."""
+        return monotonic() - self.last_input
+
+    def filter_focus_events(self, keys: list[int]) -> list[int]:
+        """Убирает из нажатий последовательности событий фокуса «ESC [ I» и «ESC [ O», запоминая фокус."""
+        result: list[int] = []
+        i: int = 0
+        while i < len(keys):
+            sequence: tuple = tuple(keys[i:i + 3])
+            if sequence in (FOCUS_IN, FOCUS_OUT):
+                self.focused = sequence == FOCUS_IN
+                i += 3
+                continue
+            result.append(keys[i])
+            i += 1
+        return result
+
+    def summary(self) -> str:
+        """Возвращает краткую сводку пробуждений и процессорного времени."""
+        return (
+            f'{self.wakeups_per_second:.1f} wakeups/s, cpu {self.cpu_share * 100:.2f}%, '
+            f'всего {self.wakeups_total + self.wakeups} wakeups, {process_time():.2f}s cpu'
+        )
@@ -0,0 +1,75 @@
+from array import array
+from bisect import bisect_left
+from time import perf_counter
+
+STAGES: tuple[str, ...] = ('config', 'sysinfo', 'sensors', 'glyphs', 'draw', 'refresh')
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными границами корзин от 1 мкс до 10 с по шкале 1-2-5."""
+    __slots__ = ('counts', 'count', 'total', 'maximum')
+    bounds: tuple[float, ...] = tuple(m * 10 ** e / 1_000_000 for e in range(7) for m in (1, 2, 5)) + (10.0,)
+
+    def __init__(self):
+        self.counts = array('q', bytes(8 * (len(self.bounds) + 1)))
+        self.count: int = 0
+        self.total: float = 0.0
+        self.maximum: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Добавляет длительность в соответствующую корзину."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, share: float) -> float:
+        """Возвращает верхнюю границу корзины, в которую попадает заданная доля измерений."""
+        threshold: float = share * self.count
+        accumulated: int = 0
+        for i, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= threshold and accumulated:
+                return self.bounds[i] if i < len(self.bounds) else self.maximum
+        return 0.0
+
+    def summary(self) -> str:
+        """Возвращает краткую сводку в миллисекундах."""
+        return (
+            f'n={self.count} avg={self.total / self.count * 1000:.3f}ms p50<={self.percentile(0.5) * 1000:.3f}ms '
+            f'p95<={self.percentile(0.95) * 1000:.3f}ms max={self.maximum * 1000:.3f}ms'
+        ) if self.count else 'n=0'
+
+
+class Stage:
+    """Измеритель одного этапа, используемый как контекстный менеджер без создания объектов на каждый вызов."""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start: float = 0.0
+
+    def __enter__(self) -> 'Stage':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.histogram.add(perf_counter() - self.start)
+
+
+class Instrumentation:
+    """Набор гистограмм времени выполнения этапов кадра и фоновых опросов."""
+    __slots__ = ('histograms', 'stages')
+
+    def __init__(self, stages: tuple[str, ...] = STAGES):
+        self.histograms: dict[str, Histogram] = {stage: Histogram() for stage in stages}
+        self.stages: dict[str, Stage] = {stage: Stage(histogram) for stage, histogram in self.histograms.items()}
+
+    def measure(self, stage: str) -> Stage:
+        """Возвращает измеритель этапа для использования в операторе with."""
+        return self.stages[stage]
+
+    def create_lines(self) -> list[str]:
+        """Возвращает по строке сводки на каждый этап."""
+        return [f'{stage:<8}{histogram.summary()}' for stage, histogram in self.histograms.items()]
@@ -0,0 +1,289 @@
+import os
+import glob
+import math
+import mmap
+import struct
+from bisect import bisect_right
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from logging import getLogger
+from typing import NamedTuple
+
+from .workers import Worker
+from .backends import Sample, OutputBackend
+
+MAGIC: bytes = b'CLKR'
+HEADER = struct.Struct('<4sBH')
+RECORD_SIZE: int = 48
+TEMPERATURE_RECORD = struct.Struct(f'<cd6f{RECORD_SIZE - 33}x')
+INFO_RECORD = struct.Struct('<cdB38s')
+INDEX_ENTRY = struct.Struct('<dI')
+NONE_FIELD: int = 0x80
+
+
+class Record(NamedTuple):
+    """
+    Запись файла: «T» — показания пяти датчиков и средняя температура, «S» — одно изменившееся поле
+    информации о системе (номер поля и текст). Отсутствующее поле (None) отмечается старшим битом номера,
+    поэтому пустая строка воспроизводится пустой строкой.
+    """
+    kind: str
+    timestamp: float
+    payload: tuple
+
+
+def encode_temperature(timestamp: float, values: tuple, average: float | None) -> bytes:
+    """Кодирует показания датчиков в запись фиксированной длины, None передаётся как NaN."""
+    return TEMPERATURE_RECORD.pack(
+        b'T', timestamp, *(math.nan if value is None else value for value in (*values, average))
+    )
+
+
+def encode_info(timestamp: float, field: int, text: str | None) -> bytes:
+    """Кодирует поле информации о системе в запись фиксированной длины, текст обрезается по границе символа."""
+    data: bytes = (text or '').encode('utf-8')[:INFO_RECORD.size - 10].decode('utf-8', 'ignore').encode('utf-8')
+    return INFO_RECORD.pack(b'S', timestamp, field | NONE_FIELD if text is None else field, data)
+
+
+def decode_record(buffer, offset: int) -> Record:
+    """Разбирает запись по смещению, неизвестный тип записи считается ошибкой файла."""
+    kind: bytes = buffer[offset:offset + 1]
+    if kind == b'T':
+        _, timestamp, *values = TEMPERATURE_RECORD.unpack_from(buffer, offset)
+        return Record('T', timestamp, tuple(None if math.isnan(value) else value for value in values))
+    if kind == b'S':
+        _, timestamp, field, data = INFO_RECORD.unpack_from(buffer, offset)
+        if field & NONE_FIELD:
+            return Record('S', timestamp, (field & ~NONE_FIELD, None))
+        return Record('S', timestamp, (field, data.rstrip(b'\0').decode('utf-8', 'ignore')))
+    raise ValueError(f'Неизвестный тип записи {kind!r} по смещению {offset}')
+
+
+def find_segments(path: str) -> list[str]:
+    """Возвращает файлы записи вида «PATH.0001» по возрастанию номера."""
+    return sorted(
+        name for name in glob.glob(f'{glob.escape(path)}.[0-9][0-9][0-9][0-9]') if os.path.isfile(name)
+    )
+
+
+def parse_moment(value: str, start: float) -> float:
+    """Разбирает момент начала воспроизведения: ISO-время или смещение в секундах от начала записи («+600»)."""
+    if value.startswith('+'):
+        return start + float(value[1:])
+    return datetime.fromisoformat(value).timestamp()
+
+
+class Recorder(OutputBackend):
+    """
+    Записывает отсчёты в файлы «PATH.NNNN» из записей фиксированной длины. Показания датчиков пишутся
+    каждый отсчёт, поля информации о системе — только при изменении. Записи копятся в памяти и сбрасываются
+    одним вызовом write, когда набирается flush_bytes или проходит flush_interval секунд. Каждые index_every
+    записей пишется ключевой кадр со всеми полями и строка разреженного индекса «PATH.NNNN.idx»,
+    по которому воспроизведение переходит к нужному моменту без просмотра файла. При превышении max_bytes
+    начинается новый файл, старше keep последних файлов удаляются.
+    """
+
+    def __init__(
+            self, path: str, max_bytes: int = 16 * 1024 * 1024, keep: int = 8, index_every: int = 64,
+            flush_bytes: int = 64 * RECORD_SIZE, flush_interval: float = 10.0
+    ):
+        self.path = path
+        self.max_bytes = max(max_bytes, HEADER.size + 64 * RECORD_SIZE)
+        self.keep = max(1, keep)
+        self.index_every = index_every
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.lock = Lock()
+        self.buffer = bytearray()
+        self.index = bytearray()
+        self.last_info: tuple = ()
+        self.last_flush: float = monotonic()
+        self.records: int = 0
+        self.indexed: int = 0
+        self.size: int = 0
+        self.written: int = 0
+        segments: list[str] = find_segments(path)
+        self.number: int = int(segments[-1].rsplit('.', 1)[1]) if segments else 0
+        self.file = None
+        self.index_file = None
+        self.open_segment()
+
+    def open_segment(self) -> None:
+        """Открывает следующий файл записи и его индекс, удаляя самые старые файлы сверх keep."""
+        self.number += 1
+        segment: str = f'{self.path}.{self.number:04d}'
+        self.file = open(segment, 'wb', buffering=0)
+        self.index_file = open(f'{segment}.idx', 'wb', buffering=0)
+        self.buffer += HEADER.pack(MAGIC, 1, RECORD_SIZE)
+        self.size, self.records, self.indexed, self.last_info = HEADER.size, 0, 0, ()
+        for old in find_segments(self.path)[:-self.keep]:
+            for name in (old, f'{old}.idx'):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+    def flush(self) -> None:
+        """Сбрасывает накопленные записи и строки индекса на диск по одному вызову write на файл."""
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer.clear()
+        if self.index:
+            self.index_file.write(self.index)
+            self.index.clear()
+        self.last_flush = monotonic()
+
+    def rotate(self) -> None:
+        """Закрывает текущий файл записи и начинает следующий."""
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+        self.open_segment()
+
+    def write(self, sample: Sample) -> None:
+        """Добавляет отсчёт в буфер: ключевой кадр или изменившиеся поля информации и показания датчиков."""
+        with self.lock:
+            if self.file is None:
+                return None
+            info: tuple = sample.info
+            keyframe: bool = self.records == 0 or self.records - self.indexed >= self.index_every
+            fields: list[int] = [
+                i for i in range(len(info)) if keyframe or i >= len(self.last_info) or info[i] != self.last_info[i]
+            ]
+            if self.size + (len(fields) + 1) * RECORD_SIZE > self.max_bytes:
+                self.rotate()
+                keyframe, fields = True, list(range(len(info)))
+            if keyframe:
+                self.index += INDEX_ENTRY.pack(sample.timestamp, self.records)
+                self.indexed = self.records
+            for field in fields:
+                self.buffer += encode_info(sample.timestamp, field, info[field])
+            self.buffer += encode_temperature(sample.timestamp, sample.sensors.values, sample.sensors.average)
+            self.records += len(fields) + 1
+            self.size += (len(fields) + 1) * RECORD_SIZE
+            self.last_info = info
+            if len(self.buffer) >= self.flush_bytes or monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+        return None
+
+    def close(self) -> None:
+        """Сбрасывает остаток буфера и закрывает файлы."""
+        with self.lock:
+            if self.file is None:
+                return None
+            self.flush()
+            self.file.close()
+            self.index_file.close()
+            self.file = self.index_file = None
+        return None
+
+
+class Segment(NamedTuple):
+    """Отображённый в память файл записи, число целых записей в нём и его разреженный индекс."""
+    path: str
+    data: mmap.mmap
+    count: int
+    index: tuple[tuple[float, int], ...]
+
+
+class RecordingReader:
+    """
+    Читает файлы записи через mmap. Переход к моменту времени идёт двоичным поиском сначала по первым
+    отметкам файлов, затем по их разреженному индексу до ближайшего ключевого кадра, после чего читается
+    не больше index_every записей. Недописанная последняя запись после аварийного завершения пропускается.
+    """
+
+    def __init__(self, path: str):
+        self.segments: list[Segment] = []
+        for name in find_segments(path):
+            segment: Segment | None = self.open_segment(name)
+            if segment is not None:
+                self.segments.append(segment)
+        if not self.segments:
+            raise FileNotFoundError(f'Файлы записи «{path}.NNNN» не найдены')
+        self.start: float = self.segments[0].index[0][0]
+        last: Segment = self.segments[-1]
+        self.end: float = decode_record(last.data, HEADER.size + (last.count - 1) * RECORD_SIZE).timestamp
+
+    @staticmethod
+    def open_segment(name: str) -> Segment | None:
+        """Отображает файл записи в память, проверяет заголовок и читает индекс. Пустой файл пропускается."""
+        with open(name, 'rb') as file:
+            size: int = os.fstat(file.fileno()).st_size
+            if size < HEADER.size + RECORD_SIZE:
+                return None
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != 1 or record_size != RECORD_SIZE:
+            data.close()
+            raise ValueError(f'Файл «{name}» не является записью часов')
+        count: int = (size - HEADER.size) // RECORD_SIZE
+        index: list[tuple[float, int]] = []
+        try:
+            with open(f'{name}.idx', 'rb') as file:
+                raw: bytes = file.read()
+            index = list(INDEX_ENTRY.iter_unpack(raw[:len(raw) - len(raw) % INDEX_ENTRY.size]))
+        except OSError:
+            pass
+        index = [(timestamp, record) for timestamp, record in index if record < count]
+        if not index:
+            index = [(decode_record(data, HEADER.size).timestamp, 0)]
+        return Segment(name, data, count, tuple(index))
+
+    def seek(self, timestamp: float) -> tuple[int, int]:
+        """Возвращает номер файла и записи ключевого кадра не позже timestamp (или самого первого)."""
+        segment: int = max(0, bisect_right([s.index[0][0] for s in self.segments], timestamp) - 1)
+        index: tuple[tuple[float, int], ...] = self.segments[segment].index
+        position: int = max(0, bisect_right(index, (timestamp, float('inf'))) - 1)
+        return segment, index[position][1]
+
+    def read(self, segment: int, record: int):
+        """Возвращает записи по порядку, начиная с заданной позиции, с переходом в следующие файлы."""
+        for current in self.segments[segment:]:
+            for i in range(record, current.count):
+                yield decode_record(current.data, HEADER.size + i * RECORD_SIZE)
+            record = 0
+
+    def close(self) -> None:
+        """Закрывает отображения файлов."""
+        for segment in self.segments:
+            segment.data.close()
+
+
+class Replayer(Worker):
+    """
+    Фоновое воспроизведение записи с ускорением speed: записи передаются в apply в темпе записанного времени,
+    а get_time возвращает текущий момент записи для цифр часов и отсчётов. Записи между ключевым кадром
+    и точкой начала применяются сразу, без ожидания.
+    """
+
+    def __init__(self, reader: RecordingReader, apply, speed: int = 1, start: float | None = None):
+        super().__init__(name='replay')
+        self.reader = reader
+        self.apply = apply
+        self.speed = speed
+        self.origin: float = reader.start if start is None else min(max(start, reader.start), reader.end)
+        self.started: float = monotonic()
+
+    def get_time(self) -> float:
+        """Возвращает текущий момент записи, после её окончания — время последней записи."""
+        return min(self.origin + (monotonic() - self.started) * self.speed, self.reader.end)
+
+    def run(self) -> None:
+        """Передаёт записи в apply, ожидая их момента по ускоренным часам воспроизведения."""
+        self.started = monotonic()
+        try:
+            for record in self.reader.read(*self.reader.seek(self.origin)):
+                while (delay := (record.timestamp - self.get_time()) / self.speed) > 0:
+                    if not self.sleep(delay):
+                        return None
+                if self.stop_event.is_set():
+                    return None
+                self.apply(record)
+        except ValueError as e:
+            getLogger().error('Воспроизведение остановлено: %s', e)
+            return None
+        getLogger().info('Воспроизведение записи закончено.')
+        return None
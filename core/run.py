@@ -1,12 +1,28 @@
-from time import sleep, time
-from threading import Thread
+import os
+import sys
+import signal
+import select
+from time import monotonic
+from datetime import datetime
+from threading import Event
+from typing import TYPE_CHECKING
 
 from .clock import Clock
 from .info import Info
-from .temperature import Temperature
+from .temperature import EMPTY_SNAPSHOT, Temperature
+from .dashboard import Dashboard
+from .workers import PeriodicWorker
+from .scheduler import TickScheduler
+from .power import PowerMonitor
+from .visualisation import KEY_RESIZE, error, resizeterm, ungetch
 
+if TYPE_CHECKING:
+    from .backends import Sample, OutputBackend
+    from .server import MetricsServer
+    from .recorder import Record, Recorder, RecordingReader, Replayer
 
-class Additionally(Clock, Info, Temperature):
+
+class Additionally(Clock, Info, Temperature, Dashboard):
     message = {
         "ru": "\nМодули часов и информации деактивированы, что ещё ты хочешь здесь увидеть?",
         "en": "\nClock and info modules are disabled, what else do you want to see here?"
@@ -17,57 +33,473 @@ class Additionally(Clock, Info, Temperature):
         def __init__(self, message: dict[str, str], key: str):
             super().__init__(message[key])
 
-    def renew(self):
-        """Обновляет необходимые атрибуты."""
-        self.variables = self.get_config_data('config')
-        self.digits_color = self.variables['digits_color']
-        self.info_color = self.variables['system_info_color']
-        self.logo_color = self.variables['logo_color']
-        self.clock = self.variables['clock']
-        self.system_info = self.variables['system_info']
-        self.language = self.variables['language']
-        self.logo_name = self.variables['logo_name']
-        self.info = self.get_system_info()
-        self.temperature = self.get_temperature_info()
-        self.average_temperature = self.calculate_average_temperature()
-
     def get_info_modules(self, stdscr) -> None:
-        """Обновляет и отображает информацию о системе, температуре и логотипе."""
+        """
+        Отображает информацию о системе, температуре и логотипе или, если запущен приём показаний других хостов,
+        стойку. Данные обновляются фоновыми потоками, здесь читаются только их последние снимки.
+        """
+        if self.host_table is not None:
+            self.display_dashboard(stdscr)
+            return None
         self.display_logo(stdscr), self.display_info(stdscr), self.display_system_info(stdscr)
-        self.display_temperature_info(stdscr), self.verify_temperature_indicator(stdscr), self.renew()
+        self.display_temperature_info(stdscr), self.verify_temperature_indicator(stdscr)
+        self.display_temperature_sparkline(stdscr)
+        return None
+
+    def create_sample(self) -> 'Sample':
+        """
+        Собирает отсчёт из последних снимков информации о системе и датчиков со временем кадра.
+        Модуль способов вывода импортируется только при первом отсчёте.
+        """
+        from .backends import Sample
+        return Sample(self.get_frame_time(), self.info, self.sensors)
 
 
 class RunProgram(Additionally):
-    __slots__ = ('running', 'fps')
+    __slots__ = (
+        'stop_event', 'wake_pipe', 'fps', 'clock_scheduler', 'info_scheduler', 'metrics_server', 'show_timings',
+        'timings_worker', 'power', 'resize_pending', 'started', 'first_frame', 'info_pending', 'recorder', 'replayer'
+    )
 
     def __init__(self):
         super().__init__()
-        self.running = True
+        self.stop_event = Event()
+        self.wake_pipe: tuple[int, int] | None = None
         self.fps = 10
+        self.clock_scheduler = TickScheduler(1.0, aligned=True)
+        self.info_scheduler = TickScheduler(lambda: self.settings.info_interval)
+        self.metrics_server: 'MetricsServer | None' = None
+        self.show_timings: bool = False
+        self.timings_worker: PeriodicWorker | None = None
+        self.power = PowerMonitor()
+        self.resize_pending: bool = False
+        self.started: float = monotonic()
+        self.first_frame: float | None = None
+        self.info_pending: bool = False
+        self.recorder: 'Recorder | None' = None
+        self.replayer: 'Replayer | None' = None
+
+    @property
+    def running(self) -> bool:
+        return not self.stop_event.is_set()
+
+    @running.setter
+    def running(self, value: bool) -> None:
+        """Сброс флага будит поток отрисовки, ожидающий следующего кадра или нажатия клавиши."""
+        if value:
+            self.stop_event.clear()
+            return None
+        self.stop_event.set()
+        self.wake_render_loop()
+        return None
+
+    def wake_render_loop(self) -> None:
+        """Прерывает ожидание потока отрисовки через канал пробуждения."""
+        if self.wake_pipe is not None:
+            try:
+                os.write(self.wake_pipe[1], b'\0')
+            except OSError:
+                pass
+
+    def start_workers(self, collect: bool = False) -> None:
+        """
+        Запускает фоновые потоки, которые готовят снимки данных. При collect информация о системе
+        и датчики опрашиваются, даже если их вывод на экран отключён.
+        """
+        self.start_config_watcher()
+        self.start_timings_worker()
+        if (self.system_info or collect or self.recorder is not None) and self.replayer is None:
+            self.start_system_info_worker()
+            self.start_sensors_worker()
+
+    def stop_workers(self) -> None:
+        """Останавливает все фоновые потоки обновления данных."""
+        self.stop_config_watcher()
+        self.stop_system_info_worker()
+        self.stop_sensors_worker()
+        self.stop_recording()
+        self.stop_replay()
+        self.stop_metrics_server()
+        self.stop_aggregator()
+        self.stop_timings_worker()
+
+    def start_timings_worker(self) -> None:
+        """Запускает фоновую запись сводки замеров в журнал раз в timings_log_interval секунд."""
+        if self.timings_worker is None:
+            self.timings_worker = PeriodicWorker(
+                'timings', self.log_timings, lambda: self.settings.timings_log_interval
+            )
+            self.timings_worker.start()
+
+    def stop_timings_worker(self) -> None:
+        """Останавливает фоновую запись сводки замеров."""
+        if self.timings_worker is not None:
+            self.timings_worker.stop()
+            self.timings_worker = None
 
-    def wait_for_enter(self, stdscr) -> None:
-        """Ждёт нажатия клавиши и устанавливает флаг остановки."""
-        stdscr.getch()
-        self.running: bool = False
+    def create_timings_lines(self) -> list[str]:
+        """Составляет сводку времени этапов, числа выведенных символов и обращений к кэшу изображений."""
+        stats: dict[str, int] = self.glyphs_stats
+        return [
+            *self.timings.create_lines(),
+            f'cells   {self.cells_per_second:.0f}/s, всего {self.cells_written + self.cells_counter}',
+            f'glyphs  hits={stats["hits"]} misses={stats["misses"]} reloads={stats["reloads"]}',
+            f'power   {"idle" if self.idle else "active"}, {self.power.summary()}',
+            f'startup first frame {(self.first_frame or 0.0) * 1000:.1f} ms'
+        ]
 
-    def create_main_loop(self, stdscr, function) -> None:
-        """Запускает все модули программы в цикле."""
-        while self.running:
-            start_time: float = time()
+    def log_timings(self) -> None:
+        """Записывает сводку времени этапов в журнал, если уже есть измерения."""
+        if not any(histogram.count for histogram in self.timings.histograms.values()):
+            return None
+        for line in self.create_timings_lines():
+            self.logger.info('Замеры: %s', line)
+        return None
+
+    def display_timings(self, stdscr) -> None:
+        """Отображает сводку времени этапов поверх экрана, если она включена клавишей «p»."""
+        if self.show_timings:
+            data: list[str] = [f'{line:<90}' for line in self.create_timings_lines()]
+            self.display_symbols(stdscr, len(data), 0, 0, data, self.paint(self.info_color, True))
+
+    def mark_first_frame(self) -> None:
+        """Запоминает и записывает в журнал время от запуска процесса до первого кадра на экране."""
+        self.first_frame = monotonic() - self.started
+        self.logger.info('Первый кадр выведен через %.1f мс после запуска.', self.first_frame * 1000)
+
+    def has_first_data(self) -> bool:
+        """Проверяет, собрали ли фоновые потоки первые данные о системе и датчиках."""
+        return self.static_info is not None and self.sensors is not EMPTY_SNAPSHOT
+
+    def wait_for_first_data(self, timeout: float = 2.0) -> None:
+        """Ждёт первого сбора данных фоновыми потоками, но не дольше timeout секунд."""
+        deadline: float = monotonic() + timeout
+        while self.running and not self.has_first_data() and monotonic() < deadline:
+            self.stop_event.wait(0.01)
+
+    def verify_info_frame(self) -> bool:
+        """
+        Проверяет, можно ли рисовать информацию о системе. При быстром запуске она ждёт первого сбора
+        данных фоновыми потоками, но не дольше двух секунд после первого кадра.
+        """
+        if self.info_pending and self.first_frame is not None:
+            waited: float = monotonic() - self.started - self.first_frame
+            self.info_pending = not self.has_first_data() and waited < 2.0
+        return not self.info_pending
+
+    def render_module(self, stdscr, function) -> None:
+        """
+        Рисует модуль, измеряя время отрисовки, и обновляет сводку замеров, если она показана.
+        В режиме простоя рисуются только цифры часов.
+        """
+        self.update_idle(stdscr)
+        if self.idle and function != self.display_digits:
+            return None
+        with self.timings.measure('draw'):
             function(stdscr)
-            stdscr.refresh()
-            elapsed_time: float = time() - start_time
-            time_to_sleep: float = 1.0 / max(1, self.fps) - elapsed_time
-            if time_to_sleep > 0:
-                sleep(time_to_sleep)
-
-    def create_wrapped_threads(self) -> None:
-        """Запускает потоки для выполнения модулей в зависимости от наличия системной информации."""
-        self.safe_wrapper(self.init_curses, None)
-        Thread(target=self.safe_wrapper, args=(self.wait_for_enter, None)).start()
-        if self.system_info:
-            Thread(target=self.safe_wrapper, args=(self.create_main_loop, self.get_info_modules)).start()
+        self.display_timings(stdscr)
+        return None
+
+    def set_focus_reporting(self, enabled: bool) -> None:
+        """Включает или выключает сообщения терминала о получении и потере фокуса (ESC [ I и ESC [ O)."""
+        if self.settings.power_saving and sys.__stdout__ is not None and sys.__stdout__.isatty():
+            sys.__stdout__.write('\x1b[?1004h' if enabled else '\x1b[?1004l')
+            sys.__stdout__.flush()
+
+    def set_idle(self, stdscr, idle: bool) -> None:
+        """
+        Переключает режим простоя: в нём остаются только цифры часов, датчики опрашиваются
+        раз в idle_sensor_interval секунд, а сбор информации о системе приостановлен. При выходе из простоя
+        экран перерисовывается сразу, а фоновые потоки будятся, чтобы не ждать конца долгого интервала.
+        """
+        if idle == self.idle:
+            return None
+        self.idle = idle
+        stdscr.clear()
+        self.invalidate_frame()
+        self.clock_scheduler.due = self.info_scheduler.due = float('-inf')
+        if not idle:
+            for worker in (self.sensors_worker, self.system_info_worker):
+                if worker is not None:
+                    worker.wake()
+        self.logger.info('Режим простоя %s: %s', 'включён' if idle else 'выключен', self.power.summary())
+        return None
+
+    def update_idle(self, stdscr) -> None:
+        """Включает режим простоя, если терминал потерял фокус или клавиши не нажимались дольше idle_timeout."""
+        settings = self.settings
+        if not settings.power_saving:
+            self.set_idle(stdscr, False)
+            return None
+        timeout: float = settings.idle_timeout
+        if not self.power.focused or (timeout and self.power.get_idle_time() > timeout):
+            self.set_idle(stdscr, True)
+        return None
+
+    def update_temperature_info(self) -> None:
+        """
+        Опрашивает датчики и сразу обновляет готовые ответы HTTP-сервера и запись, если они запущены.
+        HTTP-сервер получает отсчёт только после первого сбора информации о системе, до этого он отвечает 503.
+        """
+        super().update_temperature_info()
+        if self.metrics_server is None and self.recorder is None:
+            return None
+        sample: 'Sample' = self.create_sample()
+        if self.metrics_server is not None and self.has_first_data():
+            self.metrics_server.write(sample)
+        if self.recorder is not None:
+            self.recorder.write(sample)
+        return None
+
+    def start_recording(self, recorder: 'Recorder') -> None:
+        """
+        Включает запись отсчётов: каждый опрос датчиков вместе с изменившейся информацией о системе
+        добавляется в буфер записи. Фоновые потоки данных запускаются, даже если их вывод на экран отключён.
+        """
+        self.recorder = recorder
+        self.logger.info('Запись показаний в «%s.NNNN».', recorder.path)
+
+    def stop_recording(self) -> None:
+        """Сбрасывает буфер записи на диск и закрывает её файлы."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+            self.logger.info('Запись остановлена, записано %d Б.', recorder.written)
+
+    def apply_record(self, record: 'Record') -> None:
+        """
+        Применяет запись воспроизведения к снимкам информации и датчиков, которые рисует обычный рендерер.
+        Показания датчиков из записи, как и при живом опросе, сразу публикуются HTTP-сервером метрик.
+        """
+        if record.kind == 'S':
+            field, text = record.payload
+            info: list = list(self.info)
+            info[field] = text
+            self.info = tuple(info)
+            if 2 <= field <= 7:
+                self.static_info = tuple(self.info[2:8])
+            return None
+        self.sensors = self.create_temperature_snapshot(record.payload[:5])
+        if self.metrics_server is not None and self.has_first_data():
+            self.metrics_server.write(self.create_sample())
+        return None
+
+    def start_replay(self, reader: 'RecordingReader', speed: int = 1, start: float | None = None) -> None:
+        """
+        Запускает воспроизведение записи вместо опроса датчиков и сбора информации о системе. Часы показывают
+        время записи, а кадры часов и информации выводятся в speed раз чаще (не чаще fps).
+        Уже запущенный живой опрос останавливается, чтобы не перезаписывать воспроизводимые снимки.
+        """
+        from .recorder import Replayer
+        self.stop_system_info_worker()
+        self.stop_sensors_worker()
+        self.replayer = Replayer(reader, self.apply_record, speed, start)
+        self.time_source = self.replayer.get_time
+        self.clock_scheduler = TickScheduler(1.0 / speed)
+        self.info_scheduler = TickScheduler(lambda: self.settings.info_interval / speed)
+        self.replayer.start()
+        self.logger.info(
+            'Воспроизведение записи с %s, ускорение %dx.', datetime.fromtimestamp(self.replayer.origin), speed
+        )
+
+    def stop_replay(self) -> None:
+        """Останавливает воспроизведение и закрывает файлы записи."""
+        replayer, self.replayer = self.replayer, None
+        if replayer is not None:
+            replayer.stop()
+            replayer.join(1.0)
+            replayer.reader.close()
+
+    def start_metrics_server(self, server: 'MetricsServer') -> None:
+        """
+        Запускает HTTP-сервер метрик и фоновые потоки, которые готовят для него данные.
+        При воспроизведении записи данные приходят из неё, и живой опрос не запускается.
+        """
+        self.metrics_server = server
+        if self.has_first_data():
+            server.write(self.create_sample())
+        server.start()
+        if self.replayer is None:
+            self.start_system_info_worker()
+            self.start_sensors_worker()
+        self.logger.info('HTTP-сервер метрик запущен на %s:%d.', *server.address)
+
+    def stop_metrics_server(self) -> None:
+        """Останавливает HTTP-сервер метрик."""
+        server, self.metrics_server = self.metrics_server, None
+        if server is not None:
+            server.close()
+
+    def wait_for_keys(self, stdscr, delay: float) -> list[int]:
+        """
+        Ждёт нажатия клавиш не дольше delay секунд. Там, где это возможно, ожидание идёт через select
+        вместе с каналом пробуждения, чтобы остановка программы не ждала конца задержки.
+        """
+        if self.wake_pipe is None:
+            stdscr.timeout(max(0, int(delay * 1000)))
+            key: int = stdscr.getch()
+            return [key] if key != -1 else []
+        try:
+            readable, _, _ = select.select([sys.stdin, self.wake_pipe[0]], [], [], max(0.0, delay))
+        except (OSError, ValueError):
+            readable = []
+        if self.wake_pipe[0] in readable:
+            os.read(self.wake_pipe[0], 64)
+        keys: list[int] = []
+        while (key := stdscr.getch()) != -1:
+            keys.append(key)
+        if not keys and sys.stdin in readable:
+            self.verify_input()
+        return keys
+
+    @staticmethod
+    def is_input_closed() -> bool:
+        """
+        Проверяет стандартный ввод, готовый по select, из которого не пришло ни одной клавиши: конец файла
+        или ошибка чтения (EIO после обрыва связи с терминалом) означают, что клавиш больше не будет.
+        Если байт всё же прочитан, он возвращается в очередь curses.
+        """
+        fd: int = sys.stdin.fileno()
+        try:
+            if not select.select([fd], [], [], 0)[0]:
+                return False
+            data: bytes = os.read(fd, 1)
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+        if data:
+            ungetch(data[0])
+        return not data
+
+    def verify_input(self) -> None:
+        """Завершает работу, если стандартный ввод закрыт и клавиш больше не будет."""
+        if self.is_input_closed():
+            self.logger.info('Стандартный ввод закрыт, приложение завершает работу.')
+            self.running = False
+
+    def handle_key(self, stdscr, key: int) -> None:
+        """
+        Обрабатывает клавишу: изменение размера терминала перерисовывает экран, «p» показывает или скрывает
+        сводку замеров, остальные клавиши завершают работу. В режиме простоя любая клавиша только будит программу.
+        """
+        self.power.last_input = monotonic()
+        self.power.focused = True
+        if self.idle and key != KEY_RESIZE:
+            self.set_idle(stdscr, False)
+            return None
+        if key == KEY_RESIZE:
+            self.resize_screen(stdscr)
+            return None
+        if key in (ord('p'), ord('P')):
+            self.show_timings = not self.show_timings
+            stdscr.clear()
+            self.invalidate_frame()
+            self.clock_scheduler.due = self.info_scheduler.due = float('-inf')
+            return None
+        self.running = False
+        return None
+
+    def handle_resize(self, _signum, _frame) -> None:
+        """Обработчик SIGWINCH: только отмечает изменение размера и будит поток отрисовки."""
+        self.resize_pending = True
+        self.wake_render_loop()
+
+    def resize_screen(self, stdscr) -> None:
+        """Подгоняет curses под новый размер терминала, пересчитывает раскладку и перерисовывает экран."""
+        self.resize_pending = False
+        try:
+            size: os.terminal_size = os.get_terminal_size(sys.__stdout__.fileno())
+            resizeterm(size.lines, size.columns)
+        except (AttributeError, OSError, ValueError, error):
+            pass
+        stdscr.clear()
+        self.apply_layout(stdscr)
+        self.clock_scheduler.due = self.info_scheduler.due = float('-inf')
+
+    def handle_keys(self, stdscr, keys: list[int]) -> None:
+        """Обрабатывает события фокуса терминала и нажатия клавиш, полученные за одно ожидание."""
+        focused: bool = self.power.focused
+        keys = self.power.filter_focus_events(keys)
+        if self.power.focused and not focused:
+            self.power.last_input = monotonic()
+            self.set_idle(stdscr, False)
+        elif not self.power.focused:
+            self.update_idle(stdscr)
+        for key in keys:
+            self.handle_key(stdscr, key)
+
+    def create_render_loop(self, stdscr) -> None:
+        """
+        Единственный поток, работающий с curses. Каждый проход собирает один кадр из модулей, время которых
+        наступило, выводит его одним обновлением терминала и ждёт следующего кадра или нажатия клавиши.
+        В режиме простоя ожидание определяют только часы, поэтому поток просыпается раз в секунду.
+        Фоновые потоки данных запускаются только после первого кадра часов, а информация о системе
+        до первого сбора данных не рисуется.
+        """
+        self.init_curses(stdscr)
+        stdscr.nodelay(True)
+        schedulers: list[tuple[TickScheduler, object]] = []
         if self.clock:
-            self.safe_wrapper(self.create_main_loop, self.display_digits)
-        if not self.system_info and not self.clock:
+            schedulers.append((self.clock_scheduler, self.display_digits))
+        if self.system_info or self.host_table is not None:
+            schedulers.append((self.info_scheduler, self.get_info_modules))
+        self.info_pending = self.clock and self.system_info and self.host_table is None
+        if self.verify_os() != 'Windows':
+            self.wake_pipe = os.pipe()
+        resize_handler: object = False
+        if hasattr(signal, 'SIGWINCH') and self.wake_pipe is not None:
+            try:
+                resize_handler = signal.signal(signal.SIGWINCH, self.handle_resize) or signal.SIG_DFL
+            except ValueError:
+                pass
+        self.set_focus_reporting(True)
+        try:
+            while self.running:
+                self.power.add_wakeup()
+                if self.resize_pending:
+                    self.resize_screen(stdscr)
+                active: list[tuple[TickScheduler, object]] = [
+                    (scheduler, function) for scheduler, function in schedulers
+                    if function == self.display_digits or not self.idle and self.verify_info_frame()
+                ]
+                for scheduler, function in active:
+                    if scheduler.is_due():
+                        scheduler.settle()
+                        self.render_module(stdscr, function)
+                        scheduler.get_delay(self.fps)
+                self.flush(stdscr)
+                if self.first_frame is None:
+                    self.mark_first_frame()
+                    self.start_workers()
+                delay: float = min((scheduler.due for scheduler, _ in active), default=monotonic() + 1.0) - monotonic()
+                self.handle_keys(stdscr, self.wait_for_keys(stdscr, delay))
+        finally:
+            self.set_focus_reporting(False)
+            if resize_handler is not False:
+                signal.signal(signal.SIGWINCH, resize_handler)
+            pipe, self.wake_pipe = self.wake_pipe, None
+            if pipe is not None:
+                os.close(pipe[0]), os.close(pipe[1])
+
+    def run_render_loop(self) -> None:
+        """
+        Запускает поток отрисовки и фоновые потоки данных в зависимости от включённых модулей. Если часы включены,
+        потоки данных запускает сам поток отрисовки после первого кадра.
+        """
+        if not self.system_info and not self.clock and self.host_table is None:
             raise self.NoThreadsError(self.message, self.verify_language(self.language))
+        if not self.clock:
+            self.start_workers()
+        self.safe_wrapper(self.create_render_loop)
+        self.running = False
+
+    def run_headless(self, backends: list['OutputBackend']) -> None:
+        """
+        Запускает фоновые потоки данных и выводит отсчёты без curses через заданные способы вывода.
+        Первый отсчёт ждёт первого сбора данных, чтобы не выводить пустые значения.
+        """
+        self.start_workers(collect=True)
+        self.wait_for_first_data()
+        from .backends import SamplePipeline
+        SamplePipeline(self, backends).run()
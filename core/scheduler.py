@@ -0,0 +1,59 @@
+from math import floor
+from time import time, sleep, monotonic
+
+from .workers import resolve_interval
+
+
+class TickScheduler:
+    """
+    Вычисляет задержку до следующего кадра. В режиме aligned кадры выравниваются по границам интервала
+    настенного времени (для часов это начало каждой секунды), иначе идут с заданным интервалом
+    по монотонным часам без накопления погрешности. Частота кадров fps служит только верхним пределом.
+    """
+    __slots__ = ('interval', 'aligned', 'deadline', 'target', 'last_frame', 'due')
+
+    def __init__(self, interval, aligned: bool = False):
+        self.interval = interval
+        self.aligned = aligned
+        self.deadline: float = monotonic()
+        self.target: float = 0.0
+        self.last_frame: float = float('-inf')
+        self.due: float = float('-inf')
+
+    def get_delay(self, fps: int) -> float:
+        """Возвращает время ожидания до следующего кадра с учётом ограничения частоты кадров."""
+        interval: float = resolve_interval(self.interval)
+        now: float = monotonic()
+        if self.aligned:
+            wall: float = time()
+            self.target = (floor(wall / interval) + 1) * interval
+            delay: float = self.target - wall
+        else:
+            self.deadline = max(self.deadline + interval, now)
+            delay: float = self.deadline - now
+        delay = max(delay, self.last_frame + 1.0 / max(1, fps) - now)
+        self.due = now + delay
+        return delay
+
+    def is_due(self, tolerance: float = 0.001) -> bool:
+        """Проверяет, наступило ли время следующего кадра."""
+        return monotonic() >= self.due - tolerance
+
+    def get_remainder(self) -> float:
+        """Возвращает остаток времени до границы интервала, если ожидание закончилось чуть раньше неё."""
+        if self.aligned:
+            remainder: float = self.target - time()
+            if 0 < remainder < 0.05:
+                return remainder
+        return 0.0
+
+    def mark_frame(self) -> None:
+        """Отмечает время вывода кадра."""
+        self.last_frame = monotonic()
+
+    def settle(self) -> None:
+        """Дожидается границы интервала, если поток проснулся чуть раньше неё, и отмечает кадр."""
+        remainder: float = self.get_remainder()
+        if remainder:
+            sleep(remainder)
+        self.mark_frame()
@@ -0,0 +1,66 @@
+import json
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends import Sample, OutputBackend, PrometheusBackend
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Отдаёт заранее сериализованные ответы из памяти, не обращаясь к датчикам."""
+    server_version = 'Clock'
+    paths: dict[str, str] = {'/': 'json', '/status': 'json', '/metrics': 'prometheus'}
+
+    def do_GET(self) -> None:
+        """Отвечает на запрос последним готовым ответом или кодом 404/503."""
+        kind: str | None = self.paths.get(self.path.split('?', 1)[0])
+        if kind is None:
+            self.send_error(404)
+            return None
+        response: tuple[str, bytes] | None = self.server.responses.get(kind)
+        if response is None:
+            self.send_error(503, 'No sample yet')
+            return None
+        content_type, body = response
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return None
+
+    def log_message(self, format: str, *args) -> None:
+        """Не пишет каждый запрос в stderr, чтобы не портить экран curses."""
+
+
+class MetricsServer(OutputBackend):
+    """
+    Небольшой HTTP-сервер в фоновом потоке: / и /status отдают последний отсчёт в json, /metrics —
+    в текстовом формате Prometheus. Тела ответов сериализуются один раз на отсчёт и подменяются целиком.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9101):
+        self.httpd = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.responses = {}
+        self.thread = Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def start(self) -> None:
+        """Запускает обработку запросов в фоновом потоке."""
+        self.thread.start()
+
+    def write(self, sample: Sample) -> None:
+        """Сериализует отсчёт и одним присваиванием подменяет готовые ответы."""
+        self.httpd.responses = {
+            'json': ('application/json; charset=utf-8', json.dumps(sample.as_dict(), ensure_ascii=False).encode()),
+            'prometheus': ('text/plain; version=0.0.4; charset=utf-8', PrometheusBackend.create_text(sample).encode())
+        }
+
+    def close(self) -> None:
+        """Останавливает сервер и закрывает сокет."""
+        if self.thread.is_alive():
+            self.httpd.shutdown()
+        self.httpd.server_close()
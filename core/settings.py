@@ -0,0 +1,233 @@
+import os
+import re
+import select
+import struct
+from dataclasses import dataclass, fields
+
+from .workers import Worker
+
+COLORS: tuple[str, ...] = ('MAGENTA', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'WHITE', 'BLACK')
+WATCHERS: tuple[str, ...] = ('auto', 'inotify', 'polling')
+SENSOR_BACKENDS: tuple[str, ...] = ('auto', 'sysfs', 'psutil')
+FONT_SIZES: tuple[str, ...] = ('auto', 'large', 'medium', 'small')
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Неизменяемый проверенный снимок файла конфигурации с номером версии."""
+    digits_color: str | int
+    system_info_color: str | int
+    logo_color: str | int
+    clock: bool
+    system_info: bool
+    language: str
+    logo_name: str
+    config_watcher: str
+    config_poll_interval: float
+    system_info_ttl: float
+    dns_timeout: float
+    sensor_interval: float
+    sensor_backend: str
+    history_size: int
+    sparkline: bool
+    info_interval: float
+    timings_log_interval: float
+    dashboard_capacity: int
+    dashboard_ttl: float
+    power_saving: bool
+    idle_timeout: float
+    idle_sensor_interval: float
+    font: str
+    world_clock: tuple[str, ...]
+    version: int = 0
+
+    @staticmethod
+    def verify_color(key: str, value) -> str | int:
+        """
+        Проверяет цвет: название одного из основных цветов, номер цвета 256-цветной палитры
+        или строка вида «#RRGGBB».
+        """
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 255:
+            return value
+        if isinstance(value, str):
+            if value.upper() in COLORS:
+                return value.upper()
+            if re.fullmatch(r'#[0-9a-fA-F]{6}', value):
+                return value.lower()
+        raise ValueError(
+            f'Недопустимый цвет в ключе «{key}»: {value!r} (доступные: {", ".join(COLORS)}, 0-255 или #RRGGBB)'
+        )
+
+    @staticmethod
+    def verify_type(key: str, value, expected: type | tuple[type, ...]):
+        """Проверяет тип значения, не принимая bool вместо числа."""
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            raise ValueError(f'Недопустимое значение в ключе «{key}»: {value!r}')
+        return value
+
+    @staticmethod
+    def verify_positive(key: str, value) -> float:
+        """Проверяет, что значение является положительным числом."""
+        Settings.verify_type(key, value, (int, float))
+        if value <= 0:
+            raise ValueError(f'Значение в ключе «{key}» должно быть больше нуля: {value!r}')
+        return float(value)
+
+    @staticmethod
+    def verify_non_negative(key: str, value) -> float:
+        """Проверяет, что значение является неотрицательным числом."""
+        Settings.verify_type(key, value, (int, float))
+        if value < 0:
+            raise ValueError(f'Значение в ключе «{key}» не может быть отрицательным: {value!r}')
+        return float(value)
+
+    @staticmethod
+    def verify_size(key: str, value, minimum: int, maximum: int) -> int:
+        """Проверяет, что значение является целым числом в заданных границах."""
+        Settings.verify_type(key, value, int)
+        if not minimum <= value <= maximum:
+            raise ValueError(f'Значение в ключе «{key}» должно быть от {minimum} до {maximum}: {value!r}')
+        return value
+
+    @staticmethod
+    def verify_choice(key: str, value, choices: tuple[str, ...]) -> str:
+        """Проверяет, что значение входит в число допустимых вариантов."""
+        if value not in choices:
+            raise ValueError(f'Недопустимое значение в ключе «{key}»: {value!r} (доступные: {", ".join(choices)})')
+        return value
+
+    @staticmethod
+    def verify_zones(key: str, value, maximum: int = 16) -> tuple[str, ...]:
+        """Проверяет список названий часовых поясов базы IANA, например «UTC» или «Europe/Moscow»."""
+        if not isinstance(value, list) or not all(isinstance(name, str) and name for name in value):
+            raise ValueError(f'Ключ «{key}» должен быть списком названий часовых поясов: {value!r}')
+        if len(value) > maximum:
+            raise ValueError(f'В ключе «{key}» можно указать не больше {maximum} часовых поясов: {len(value)}')
+        return tuple(value)
+
+    @classmethod
+    def from_dict(cls, data: dict | None, defaults: dict, version: int = 0) -> 'Settings':
+        """Проверяет словарь конфигурации и создаёт снимок, недостающие ключи берутся из defaults."""
+        if not isinstance(data, dict):
+            raise ValueError('Конфигурация должна быть json-объектом')
+        merged: dict = {**defaults, **data}
+        return cls(
+            digits_color=cls.verify_color('digits_color', merged['digits_color']),
+            system_info_color=cls.verify_color('system_info_color', merged['system_info_color']),
+            logo_color=cls.verify_color('logo_color', merged['logo_color']),
+            clock=cls.verify_type('clock', merged['clock'], bool),
+            system_info=cls.verify_type('system_info', merged['system_info'], bool),
+            language=cls.verify_type('language', merged['language'], str),
+            logo_name=cls.verify_type('logo_name', merged['logo_name'], str),
+            config_watcher=cls.verify_choice('config_watcher', merged['config_watcher'], WATCHERS),
+            config_poll_interval=cls.verify_positive('config_poll_interval', merged['config_poll_interval']),
+            system_info_ttl=cls.verify_positive('system_info_ttl', merged['system_info_ttl']),
+            dns_timeout=cls.verify_positive('dns_timeout', merged['dns_timeout']),
+            sensor_interval=cls.verify_positive('sensor_interval', merged['sensor_interval']),
+            sensor_backend=cls.verify_choice('sensor_backend', merged['sensor_backend'], SENSOR_BACKENDS),
+            history_size=cls.verify_size('history_size', merged['history_size'], 1, 86400),
+            sparkline=cls.verify_type('sparkline', merged['sparkline'], bool),
+            info_interval=cls.verify_positive('info_interval', merged['info_interval']),
+            timings_log_interval=cls.verify_positive('timings_log_interval', merged['timings_log_interval']),
+            dashboard_capacity=cls.verify_size('dashboard_capacity', merged['dashboard_capacity'], 1, 65536),
+            dashboard_ttl=cls.verify_positive('dashboard_ttl', merged['dashboard_ttl']),
+            power_saving=cls.verify_type('power_saving', merged['power_saving'], bool),
+            idle_timeout=cls.verify_non_negative('idle_timeout', merged['idle_timeout']),
+            idle_sensor_interval=cls.verify_positive('idle_sensor_interval', merged['idle_sensor_interval']),
+            font=cls.verify_choice('font', merged['font'], FONT_SIZES),
+            world_clock=cls.verify_zones('world_clock', merged['world_clock']),
+            version=version
+        )
+
+    def same_values(self, other: 'Settings') -> bool:
+        """Сравнивает снимки без учёта номера версии."""
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(self) if f.name != 'version')
+
+
+class ConfigWatcher(Worker):
+    """
+    Следит за файлом конфигурации и вызывает callback при его изменении.
+    В Linux используется inotify, в остальных случаях файл опрашивается по времени изменения и размеру.
+    Между ожиданиями поток выполняет запрошенную сигналом SIGHUP перезагрузку (owner.apply_reload).
+    """
+    IN_CLOSE_WRITE, IN_MOVED_TO, IN_DELETE = 0x8, 0x80, 0x200
+    IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, owner, directory: str, name: str, callback):
+        super().__init__(name='config-watcher')
+        self.owner = owner
+        self.directory = directory
+        self.file_name = f'{name}.json'
+        self.file_path = os.path.join(directory, self.file_name)
+        self.callback = callback
+
+    def create_inotify(self) -> int | None:
+        """Создаёт дескриптор inotify для каталога конфигурации или возвращает None, если это невозможно."""
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd: int = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError, TypeError):
+            return None
+        if fd < 0:
+            return None
+        mask: int = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def has_file_event(self, buffer: bytes) -> bool:
+        """Проверяет, относится ли хотя бы одно событие inotify к файлу конфигурации."""
+        offset: int = 0
+        target: bytes = os.fsencode(self.file_name)
+        while offset + self.EVENT.size <= len(buffer):
+            _, _, _, length = self.EVENT.unpack_from(buffer, offset)
+            name: bytes = buffer[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+            if name == target:
+                return True
+            offset += self.EVENT.size + length
+        return False
+
+    def watch_inotify(self, fd: int) -> None:
+        """Ждёт событий inotify, проверяя флаг остановки не реже раза в секунду."""
+        try:
+            while not self.stop_event.is_set():
+                readable, _, _ = select.select([fd], [], [], 1.0)
+                self.owner.apply_reload()
+                if not readable:
+                    continue
+                try:
+                    buffer: bytes = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                if self.has_file_event(buffer):
+                    self.callback()
+        finally:
+            os.close(fd)
+
+    def watch_polling(self) -> None:
+        """Периодически сравнивает время изменения и размер файла конфигурации."""
+        signature = self.owner.get_file_signature(self.file_path)
+        while self.sleep(self.owner.settings.config_poll_interval):
+            self.owner.apply_reload()
+            current = self.owner.get_file_signature(self.file_path)
+            if current != signature:
+                signature = current
+                self.callback()
+
+    def run(self) -> None:
+        """Выбирает способ наблюдения в зависимости от настроек и возможностей системы."""
+        fd: int | None = None
+        if self.owner.settings.config_watcher in ('auto', 'inotify'):
+            fd = self.create_inotify()
+        if fd is not None:
+            self.owner.logger.info('Наблюдение за «%s» через inotify.', self.file_path)
+            self.watch_inotify(fd)
+        else:
+            self.owner.logger.info(
+                'Наблюдение за «%s» опросом раз в %s с.', self.file_path, self.owner.settings.config_poll_interval
+            )
+            self.watch_polling()
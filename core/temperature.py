@@ -1,61 +1,176 @@
-import psutil
+from typing import NamedTuple
 
-from .visualisation import error, color_pair, Visualisation
+from .hwmon import HwmonReader
+from .history import RingBuffer
+from .workers import PeriodicWorker
+from .settings import COLORS
+from .visualisation import Visualisation
+
+
+class TemperatureSnapshot(NamedTuple):
+    """Неизменяемый снимок показаний датчиков, их средней температуры и её истории."""
+    values: tuple[float | None, float | None, float | None, float | None, float | None]
+    average: float | None
+    smoothed: float | None = None
+    minimum: float | None = None
+    maximum: float | None = None
+    trend: tuple[float, ...] = ()
+
+
+EMPTY_SNAPSHOT = TemperatureSnapshot((None,) * 5, None)
 
 
 class Temperature(Visualisation):
+    components: tuple[tuple[str, str], ...] = (
+        ('k10temp', 'coretemp'), ('amdgpu', 'nvidia'), ('spd5118', ''), ('nvme', ''), ('acpitz', '')
+    )
+    bars: str = '▁▂▃▄▅▆▇█'
 
     def __init__(self):
         super().__init__()
-        self.temperature = self.get_temperature_info()
-        self.average_temperature = self.calculate_average_temperature()
+        self.hwmon: HwmonReader | None = None
+        self.sensors_backend: str | None = None
+        self.history: RingBuffer = RingBuffer(self.settings.history_size)
+        self.sensors: TemperatureSnapshot = EMPTY_SNAPSHOT
+        self.sensors_worker: PeriodicWorker | None = None
 
-    @staticmethod
-    def verify_hardware(first: str, second: str) -> float | None:
-        """Метод проверяет наличие датчиков температуры и возвращает текущую температуру."""
-        temperature: dict[str, list] = psutil.sensors_temperatures()
-        try:
-            if first in temperature:
-                return temperature.get(first, [])[0].current
-            elif second in temperature:
-                return temperature.get(second, [])[0].current
-            return temperature.get('acpitz', [])[0].current
-        except (IndexError, TypeError):
+    @property
+    def temperature(self) -> tuple[float | None, float | None, float | None, float | None, float | None]:
+        return self.sensors.values
+
+    @property
+    def average_temperature(self) -> float | None:
+        return self.sensors.average
+
+    def create_hwmon_reader(self, root: str = '/sys/class/hwmon') -> HwmonReader | None:
+        """
+        Метод создаёт читатель sysfs, если он выбран в настройках («sysfs» или «auto») и в системе
+        найдены нужные устройства. Иначе возвращает None, и датчики опрашиваются через psutil.
+        """
+        backend: str = self.settings.sensor_backend
+        if backend == 'psutil' or self.verify_os() != 'Linux':
             return None
+        names: tuple[str, ...] = tuple(name for pair in self.components for name in pair if name)
+        reader = HwmonReader(names, root)
+        if reader.handles:
+            return reader
+        if backend == 'sysfs':
+            self.logger.error('Датчики в «%s» не найдены, используется psutil.', root)
+        return None
+
+    def prepare_sensors(self) -> None:
+        """
+        Метод при первом опросе выбирает способ чтения датчиков. Поиск устройств в sysfs отложен до фонового
+        потока, чтобы не задерживать первый кадр.
+        """
+        if self.sensors_backend is None:
+            self.hwmon = self.create_hwmon_reader()
+            self.sensors_backend = 'psutil' if self.hwmon is None else 'sysfs'
 
-    def get_temperature_info(self) -> tuple[float, float, float, float, float] | tuple[None, None, None, None, None]:
-        """Метод получает информацию о температуре различных компонентов системы."""
+    def get_sensors_data(self) -> dict[str, float]:
+        """
+        Метод получает текущую температуру первого датчика каждого устройства из sysfs или через psutil.
+        psutil импортируется при первом обращении, поэтому без него обходится и запуск, и чтение из sysfs.
+        """
+        if self.hwmon is not None:
+            return self.hwmon.read()
+        import psutil
         try:
-            cpu: float | None = self.verify_hardware('k10temp', 'coretemp')
-            gpu: float | None = self.verify_hardware('amdgpu', 'nvidia')
-            ram: float | None = self.verify_hardware('spd5118', '')
-            storage: float | None = self.verify_hardware('nvme', '')
-            motherboard: float | None = self.verify_hardware('acpitz', '')
-            return cpu, gpu, ram, storage, motherboard
+            temperature: dict[str, list] = psutil.sensors_temperatures()
         except AttributeError:
-            return None, None, None, None, None
+            return {}
+        return {name: entries[0].current for name, entries in temperature.items() if entries}
+
+    @staticmethod
+    def verify_hardware(sensors: dict[str, float], first: str, second: str) -> float | None:
+        """Метод проверяет наличие датчиков температуры в снимке и возвращает текущую температуру."""
+        if first in sensors:
+            return sensors[first]
+        if second in sensors:
+            return sensors[second]
+        return sensors.get('acpitz')
+
+    def get_temperature_info(
+            self, sensors: dict[str, float] | None = None
+    ) -> tuple[float | None, float | None, float | None, float | None, float | None]:
+        """Метод получает информацию о температуре различных компонентов системы из одного снимка датчиков."""
+        if sensors is None:
+            sensors = self.get_sensors_data()
+        cpu, gpu, ram, storage, motherboard = (
+            self.verify_hardware(sensors, first, second) for first, second in self.components
+        )
+        return cpu, gpu, ram, storage, motherboard
+
+    def create_temperature_snapshot(
+            self, temperature: tuple[float | None, float | None, float | None, float | None, float | None]
+    ) -> TemperatureSnapshot:
+        """Метод добавляет среднюю температуру в историю и создаёт снимок со сглаженной средней температурой."""
+        settings = self.settings
+        if self.history.size != settings.history_size:
+            self.history = RingBuffer(settings.history_size)
+        average_temperature: float | None = self.calculate_average_temperature(temperature)
+        history: RingBuffer = self.history
+        if average_temperature is not None:
+            history.push(average_temperature)
+        return TemperatureSnapshot(
+            temperature, average_temperature, history.mean(), history.minimum(), history.maximum(),
+            tuple(history.last(30)) if settings.sparkline else ()
+        )
+
+    def update_temperature_info(self) -> None:
+        """Метод опрашивает датчики и подменяет снимок одним присваиванием."""
+        with self.timings.measure('sensors'):
+            self.prepare_sensors()
+            self.sensors = self.create_temperature_snapshot(self.get_temperature_info())
+
+    def get_sensor_interval(self) -> float:
+        """Метод возвращает интервал опроса датчиков, в режиме простоя растянутый до idle_sensor_interval."""
+        settings = self.settings
+        return max(settings.sensor_interval, settings.idle_sensor_interval) if self.idle else settings.sensor_interval
+
+    def start_sensors_worker(self) -> None:
+        """Метод запускает фоновый опрос датчиков раз в sensor_interval секунд, независимо от частоты кадров."""
+        if self.sensors_worker is None:
+            self.sensors_worker = PeriodicWorker('sensors', self.update_temperature_info, self.get_sensor_interval)
+            self.sensors_worker.start()
+
+    def stop_sensors_worker(self) -> None:
+        """Метод останавливает фоновый опрос датчиков."""
+        if self.sensors_worker is not None:
+            self.sensors_worker.stop()
+            self.sensors_worker = None
+        if self.hwmon is not None:
+            self.hwmon.close()
+            self.hwmon = None
+        self.sensors_backend = None
+
+    def verify_temperature_info(self, value: float | None) -> str:
+        """Метод форматирует температуру или возвращает значок ошибки, если показания нет."""
+        return f'{value:.1f}°C' if value else self.error_emoji
 
     def create_temperature_info(self, language: str = 'ru') -> dict:
         """Метод создает словарь с информацией о температуре на заданном языке."""
-        verify_temperature_info = lambda x: f'{x:.1f}°C' if x else self.error_emoji
+        verify_temperature_info = self.verify_temperature_info
+        snapshot: TemperatureSnapshot = self.sensors
+        temperature, average_temperature = snapshot.values, snapshot.average
         info: dict = {
             "ru": {
                 "─": "─" * 26,
-                "Температура ЦПУ: ": verify_temperature_info(self.temperature[0]),
-                "Температура ГПУ: ": verify_temperature_info(self.temperature[1]),
-                "Температура ОЗУ: ": verify_temperature_info(self.temperature[2]),
-                "Тмп. накопителя: ": verify_temperature_info(self.temperature[3]),
-                "Тмп. мат. платы: ": verify_temperature_info(self.temperature[4]),
-                "Средняя тмп.   : ": verify_temperature_info(self.average_temperature)
+                "Температура ЦПУ: ": verify_temperature_info(temperature[0]),
+                "Температура ГПУ: ": verify_temperature_info(temperature[1]),
+                "Температура ОЗУ: ": verify_temperature_info(temperature[2]),
+                "Тмп. накопителя: ": verify_temperature_info(temperature[3]),
+                "Тмп. мат. платы: ": verify_temperature_info(temperature[4]),
+                "Средняя тмп.   : ": verify_temperature_info(average_temperature)
             },
             "en": {
                 "─": "─" * 26,
-                "CPU temperature: ": verify_temperature_info(self.temperature[0]),
-                "GPU temperature: ": verify_temperature_info(self.temperature[1]),
-                "RAM temperature: ": verify_temperature_info(self.temperature[2]),
-                "Storage t.     : ": verify_temperature_info(self.temperature[3]),
-                "Motherboard t. : ": verify_temperature_info(self.temperature[4]),
-                "Average tmp.   : ": verify_temperature_info(self.average_temperature)
+                "CPU temperature: ": verify_temperature_info(temperature[0]),
+                "GPU temperature: ": verify_temperature_info(temperature[1]),
+                "RAM temperature: ": verify_temperature_info(temperature[2]),
+                "Storage t.     : ": verify_temperature_info(temperature[3]),
+                "Motherboard t. : ": verify_temperature_info(temperature[4]),
+                "Average tmp.   : ": verify_temperature_info(average_temperature)
             }
         }
         return info[self.verify_language(language)]
@@ -65,29 +180,55 @@ class Temperature(Visualisation):
         data: list[str] = self.get_info_list(self.create_temperature_info)
         self.display_symbols(stdscr, len(data), self.temp_y, self.temp_x, data, self.paint(self.info_color, False))
 
+    def create_sparkline(self, values: tuple[float, ...], width: int = 30) -> str:
+        """Метод строит строку-диаграмму из значений, масштабируя их между минимумом и максимумом."""
+        if not values:
+            return ' ' * width
+        low: float = min(values)
+        span: float = max(values) - low or 1.0
+        return ''.join(self.bars[min(7, int((value - low) / span * 8))] for value in values[-width:]).rjust(width)
+
+    def display_temperature_sparkline(self, stdscr) -> None:
+        """Метод отображает историю средней температуры и её минимум и максимум за окно истории."""
+        settings = self.settings
+        if not settings.sparkline:
+            return None
+        snapshot: TemperatureSnapshot = self.sensors
+        labels: dict[str, str] = {'ru': 'мин. {} / макс. {}', 'en': 'min {} / max {}'}
+        summary: str = labels[self.verify_language(settings.language)].format(
+            self.verify_temperature_info(snapshot.minimum), self.verify_temperature_info(snapshot.maximum)
+        )
+        data: tuple[str, str] = self.create_sparkline(snapshot.trend), f'{summary:<30}'
+        self.display_symbols(
+            stdscr, len(data), self.spark_y, self.spark_x, data, self.paint(settings.system_info_color, False)
+        )
+        return None
+
     def display_temperature_indicator(self, stdscr, indicators_value: int) -> None:
         """Метод отображает индикатор температуры на экране."""
         for i in range(6):
-            try:
-                verify_item = lambda x: '█████' if i < indicators_value else '     '
-                stdscr.addstr(self.idct_y, self.idct_x + i * 5, verify_item(i), color_pair(1 + i))
-            except error:
-                pass
+            verify_item = lambda x: '█████' if i < indicators_value else '     '
+            self.draw(stdscr, self.idct_y, self.idct_x + i * 5, verify_item(i), self.paint(COLORS[i], False))
 
-    def calculate_average_temperature(self) -> float | None:
+    @staticmethod
+    def calculate_average_temperature(temperature: tuple[float | None, ...]) -> float | None:
         """Метод вычисляет среднюю температуру."""
-        valid_temperatures: list = [i for i in self.temperature if isinstance(i, (int, float))]
+        valid_temperatures: list = [i for i in temperature if isinstance(i, (int, float))]
 
         if not valid_temperatures:
             return None
         return sum(valid_temperatures) / len(valid_temperatures)
 
     def verify_temperature_indicator(self, stdscr) -> None:
-        """Метод проверяет среднюю температуру и отображает соответствующий индикатор."""
+        """
+        Метод проверяет сглаженную по истории среднюю температуру и отображает соответствующий индикатор,
+        чтобы он не мерцал на границах диапазонов.
+        """
         thresholds: tuple = ((0, 40, 1), (40, 45, 2), (45, 50, 3), (50, 55, 4), (55, 60, 5), (60, 100, 6))
+        average_temperature: float | None = self.sensors.smoothed
         try:
             for lower, upper, indicator in thresholds:
-                if lower <= self.average_temperature < upper:
+                if lower <= average_temperature < upper:
                     self.display_temperature_indicator(stdscr, indicator)
                     return None
             self.display_temperature_indicator(stdscr, 0)
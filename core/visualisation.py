@@ -1,26 +1,35 @@
 from datetime import datetime
+from time import time, monotonic
 
 try:
+    import curses
     from curses import (
-        wrapper, error, curs_set, baudrate, start_color, init_pair, use_default_colors, has_colors, color_pair,
-        A_BOLD, COLOR_BLACK, COLOR_BLUE, COLOR_CYAN, COLOR_GREEN, COLOR_MAGENTA, COLOR_RED, COLOR_WHITE, COLOR_YELLOW
+        wrapper, error, doupdate, curs_set, baudrate, start_color, init_pair, use_default_colors, has_colors,
+        can_change_color, init_color, color_pair, initscr, endwin, echo, noecho, cbreak, nocbreak, resizeterm, ungetch,
+        KEY_RESIZE, A_BOLD, COLOR_BLACK, COLOR_BLUE, COLOR_CYAN, COLOR_GREEN, COLOR_MAGENTA, COLOR_RED, COLOR_WHITE,
+        COLOR_YELLOW
     )
 except ModuleNotFoundError:
     print('\nДля работы программы необходимо установить модуль curses!\n')
 
 from .base import Base
+from .settings import COLORS
+from .layout import POSITIONS, Layout, create_layout
 
 
 class Visualisation(Base):
     __slots__ = (
         'error_emoji', 'logo_y', 'logo_x', 'name_y', 'name_x', 'info_y', 'info_x', 'temp_y', 'temp_x',
-        'version_y', 'version_x', 'copy_right_y', 'copy_right_x', 'idct_y', 'idct_x', 'dgts_y', 'dgts_x'
+        'version_y', 'version_x', 'copy_right_y', 'copy_right_x', 'idct_y', 'idct_x', 'dgts_y', 'dgts_x',
+        'spark_y', 'spark_x', 'frame', 'cells_written', 'cells_per_second', 'cells_counter', 'cells_counter_start',
+        'color_pairs', 'color_attributes', 'color_version', 'next_pair', 'next_color', 'positions', 'layout',
+        'time_source'
     )
 
     def __init__(
             self, logo_y=0, logo_x=0, name_y=1, name_x=78, info_y=1, info_x=32, temp_y=2, temp_x=78,
             version_y=10, version_x=32, copy_right_y=11, copy_right_x=32, idct_y=11, idct_x=78, dgts_y=14,
-            dgts_x=((0, 16, 33), (38, 54, 71), (76, 92, 71))
+            dgts_x=((0, 16, 33), (38, 54, 71), (76, 92, 71)), spark_y=9, spark_x=78
     ):
         super().__init__()
         self.error_emoji = '¯\\_(`-`)_/¯'
@@ -40,6 +49,21 @@ class Visualisation(Base):
         self.idct_x = idct_x
         self.dgts_y = dgts_y
         self.dgts_x = dgts_x
+        self.spark_y = spark_y
+        self.spark_x = spark_x
+        self.frame: dict[tuple[int, int], tuple[str, int]] = {}
+        self.cells_written: int = 0
+        self.cells_per_second: float = 0.0
+        self.cells_counter: int = 0
+        self.cells_counter_start: float = monotonic()
+        self.color_pairs: dict[str | int, int] = {}
+        self.color_attributes: dict[tuple[str | int, bool], int] = {}
+        self.color_version: int = 0
+        self.next_pair: int = 1
+        self.next_color: int = 0
+        self.positions: dict[str, int | tuple] = {name: getattr(self, name) for name in POSITIONS}
+        self.layout: Layout = Layout('compact', 0, 0, self.positions, frozenset(), 'large', 'auto', False, ())
+        self.time_source = None
 
     @staticmethod
     def safe_wrapper(function, *args) -> None:
@@ -53,21 +77,86 @@ class Visualisation(Base):
             pass
 
     @staticmethod
-    def format_date() -> str:
-        """Возвращает текущую дату в формате 'DD.MM.YYYY'."""
-        now = datetime.now()
+    def format_date(timestamp: float | None = None) -> str:
+        """Возвращает дату timestamp или текущую дату в формате 'DD.MM.YYYY'."""
+        now = datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)
         return now.strftime("%d.%m.%Y")
 
-    @staticmethod
+    def get_frame_time(self) -> float:
+        """Возвращает время кадра: текущее или, если задан источник времени (воспроизведение записи), его значение."""
+        return time() if self.time_source is None else self.time_source()
+
+    def get_digits_y(self) -> int:
+        """Метод возвращает строку цифр часов: без информации о системе цифры поднимаются на 12 строк."""
+        return self.dgts_y if self.settings.system_info else self.dgts_y - 12
+
+    def apply_layout(self, stdscr) -> None:
+        """
+        Метод выбирает раскладку под текущий размер терминала и переносит её координаты в атрибуты модулей.
+        Вызывается при запуске и при каждом изменении размера, а не на каждом кадре.
+        """
+        height, width = stdscr.getmaxyx()
+        settings = self.settings
+        fonts: tuple[str, ...] = ('large', 'medium', 'small') if settings.font == 'auto' else (settings.font,)
+        layout: Layout = create_layout(
+            height, width, self.positions, settings.system_info, [self.get_atlas(font) for font in fonts],
+            settings.font
+        )
+        if (layout.name, layout.font) != (self.layout.name, self.layout.font):
+            self.logger.info('Раскладка экрана: %s (%dx%d), шрифт %s.', layout.name, width, height, layout.font)
+        for name in POSITIONS:
+            setattr(self, name, layout.positions[name])
+        self.layout = layout
+        self.invalidate_frame()
+
+    def draw(self, stdscr, y: int, x: int, text: str, color: int) -> None:
+        """
+        Метод выводит строку, только если в этой позиции ещё не была выведена такая же строка тем же цветом.
+        Строка заранее обрезается по ширине строки экрана из раскладки, поэтому вывод за границы не выполняется.
+        """
+        row_widths: tuple[int, ...] = self.layout.row_widths
+        if y >= len(row_widths):
+            return None
+        limit: int = row_widths[y] - x
+        if limit <= 0:
+            return None
+        if len(text) > limit:
+            text = text[:limit]
+        key: tuple[int, int] = (y, x)
+        cell: tuple[str, int] = (text, color)
+        if self.frame.get(key) == cell:
+            return None
+        try:
+            stdscr.addstr(y, x, text, color)
+        except error:
+            pass
+        self.frame[key] = cell
+        self.cells_counter += len(text)
+        return None
+
+    def invalidate_frame(self) -> None:
+        """Метод забывает выведенные строки, чтобы следующий кадр был нарисован полностью."""
+        self.frame = {}
+
+    def flush(self, stdscr) -> None:
+        """Метод отправляет все изменения кадра в терминал одним обновлением и считает выведенные символы."""
+        with self.timings.measure('refresh'):
+            stdscr.noutrefresh()
+            doupdate()
+        now: float = monotonic()
+        elapsed: float = now - self.cells_counter_start
+        if elapsed >= 1.0:
+            self.cells_written += self.cells_counter
+            self.cells_per_second = self.cells_counter / elapsed
+            self.cells_counter = 0
+            self.cells_counter_start = now
+
     def display_symbols(
-            stdscr, height: int, y: int, x: int, symbol: str | bool | list[str] | dict[str, str | bool], color: object
+            self, stdscr, height: int, y: int, x: int, symbol: str | bool | list[str] | dict[str, str | bool], color
     ) -> None:
-        """Метод отображает символы на экране."""
+        """Метод отображает символы на экране, пропуская не изменившиеся строки."""
         for i in range(height):
-            try:
-                stdscr.addstr(i + y, x, symbol[i], color)
-            except error:
-                pass
+            self.draw(stdscr, i + y, x, symbol[i], color)
 
     @staticmethod
     def verify_color(color: str) -> int:
@@ -79,29 +168,135 @@ class Visualisation(Base):
         return color_map.get(color.upper(), COLOR_WHITE)
 
     @staticmethod
-    def init_curses(stdscr) -> None:
-        """Инициализирует экран curses"""
+    def convert_hex_color(color: str) -> tuple[int, int, int]:
+        """Метод переводит строку вида «#RRGGBB» в кортеж составляющих цвета."""
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+    @staticmethod
+    def convert_xterm_color(index: int) -> tuple[int, int, int]:
+        """Метод возвращает составляющие цвета по его номеру в 256-цветной палитре xterm."""
+        basic: tuple = (
+            (0, 0, 0), (128, 0, 0), (0, 128, 0), (128, 128, 0), (0, 0, 128), (128, 0, 128), (0, 128, 128),
+            (192, 192, 192), (128, 128, 128), (255, 0, 0), (0, 255, 0), (255, 255, 0), (0, 0, 255), (255, 0, 255),
+            (0, 255, 255), (255, 255, 255)
+        )
+        if index < 16:
+            return basic[index]
+        if index >= 232:
+            level: int = 8 + (index - 232) * 10
+            return level, level, level
+        levels: tuple = (0, 95, 135, 175, 215, 255)
+        index -= 16
+        return levels[index // 36], levels[index // 6 % 6], levels[index % 6]
+
+    @staticmethod
+    def find_xterm_color(rgb: tuple[int, int, int]) -> int:
+        """Метод находит ближайший цвет в кубе 6x6x6 или в градациях серого 256-цветной палитры."""
+        levels: tuple = (0, 95, 135, 175, 215, 255)
+        nearest = lambda x: min(range(6), key=lambda i: abs(levels[i] - x))
+        r, g, b = (nearest(x) for x in rgb)
+        cube: int = 16 + 36 * r + 6 * g + b
+        gray_level: int = min(23, max(0, round((sum(rgb) / 3 - 8) / 10)))
+        distance = lambda c: sum((x - y) ** 2 for x, y in zip(rgb, Visualisation.convert_xterm_color(c)))
+        return min(cube, 232 + gray_level, key=distance)
+
+    @staticmethod
+    def find_basic_color(rgb: tuple[int, int, int]) -> str:
+        """Метод находит ближайший из восьми основных цветов."""
+        basic: dict[str, tuple[int, int, int]] = {
+            'BLACK': (0, 0, 0), 'RED': (205, 0, 0), 'GREEN': (0, 205, 0), 'YELLOW': (205, 205, 0),
+            'BLUE': (0, 0, 238), 'MAGENTA': (205, 0, 205), 'CYAN': (0, 205, 205), 'WHITE': (229, 229, 229)
+        }
+        return min(basic, key=lambda name: sum((x - y) ** 2 for x, y in zip(rgb, basic[name])))
+
+    def init_curses(self, stdscr) -> None:
+        """Инициализирует экран curses и таблицу цветовых пар."""
         stdscr.clear()
         stdscr.refresh()
         curs_set(0)
+        self.apply_layout(stdscr)
         if has_colors():
             use_default_colors()
             start_color()
+        self.build_color_table()
 
-    def paint(self, color: str, a_bold: bool) -> int:
-        """Раскрашивает текст или текстовое изображение."""
-        colors = ('MAGENTA', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'WHITE', 'BLACK')
-        for i in range(1, len(colors) + 1):
-            init_pair(i, self.verify_color(colors[i - 1]), -1)
-        try:
-            pair_index = colors.index((color or '').upper()) + 1
-        except (ValueError, AttributeError):
+    def build_color_table(self) -> None:
+        """
+        Метод один раз создаёт цветовые пары для основных цветов (пары 1-8 в порядке COLORS)
+        и для цветов из текущей конфигурации. Остальные цвета получают пары при первом обращении.
+        """
+        self.color_pairs = {}
+        self.color_attributes = {}
+        self.next_pair = 1
+        self.next_color = getattr(curses, 'COLORS', 8) - 1
+        for color in COLORS:
+            self.allocate_pair(color)
+        self.prepare_colors()
+
+    def prepare_colors(self) -> None:
+        """Метод заранее создаёт пары для цветов из текущего снимка конфигурации."""
+        settings = self.settings
+        for color in (settings.digits_color, settings.system_info_color, settings.logo_color):
+            self.allocate_pair(color)
+        self.color_version = settings.version
+
+    def get_foreground(self, color: str | int) -> int:
+        """
+        Метод возвращает номер цвета curses. Номера палитры используются как есть на 256-цветных терминалах,
+        «#RRGGBB» задаётся через init_color там, где терминал позволяет менять палитру, иначе подбирается
+        ближайший доступный цвет.
+        """
+        colors: int = getattr(curses, 'COLORS', 8)
+        if isinstance(color, str) and not color.startswith('#'):
+            return self.verify_color(color)
+        rgb: tuple[int, int, int] = (
+            self.convert_hex_color(color) if isinstance(color, str) else self.convert_xterm_color(color)
+        )
+        if isinstance(color, int) and color < colors:
+            return color
+        if isinstance(color, str) and colors > 16 and self.next_color >= 16 and can_change_color():
+            number: int = self.next_color
+            self.next_color -= 1
+            init_color(number, *(x * 1000 // 255 for x in rgb))
+            return number
+        if colors >= 256:
+            return self.find_xterm_color(rgb)
+        return self.verify_color(self.find_basic_color(rgb))
+
+    def allocate_pair(self, color: str | int) -> int:
+        """Метод создаёт цветовую пару для цвета, если её ещё нет, и возвращает её номер."""
+        pair: int | None = self.color_pairs.get(color)
+        if pair is not None:
+            return pair
+        if not has_colors():
+            pair = 0
+        elif self.next_pair >= getattr(curses, 'COLOR_PAIRS', 64):
+            rgb = self.convert_hex_color(color) if isinstance(color, str) else self.convert_xterm_color(color)
+            pair = self.allocate_pair(self.find_basic_color(rgb))
+        else:
+            pair = self.next_pair
+            init_pair(pair, self.get_foreground(color), -1)
+            self.next_pair += 1
+        self.color_pairs[color] = pair
+        return pair
+
+    def paint(self, color: str | int, a_bold: bool) -> int:
+        """Раскрашивает текст или текстовое изображение, возвращая готовый атрибут из таблицы."""
+        attribute: int | None = self.color_attributes.get((color, a_bold))
+        if attribute is not None:
+            return attribute
+        if self.color_version != self.settings.version:
+            self.prepare_colors()
+        normalized = color.upper() if isinstance(color, str) and not color.startswith('#') else color
+        if not isinstance(normalized, (str, int)) or (isinstance(normalized, str) and normalized not in COLORS
+                                                       and not normalized.startswith('#')):
             error_message = f'Цвет "{color}" не найден в доступных цветах.'
-            self.logger.error('%s (доступные: %s)', error_message, ', '.join(colors))
+            self.logger.error('%s (доступные: %s)', error_message, ', '.join(COLORS))
             raise KeyError(error_message)
-        attribute = color_pair(pair_index)
+        attribute = color_pair(self.allocate_pair(normalized))
         if a_bold:
             attribute |= A_BOLD
+        self.color_attributes[(color, a_bold)] = attribute
         return attribute
 
     def get_info_list(self, function) -> list[str]:
@@ -0,0 +1,50 @@
+from logging import getLogger
+from threading import Thread, Event
+
+
+def resolve_interval(interval) -> float:
+    """Возвращает интервал времени, который может задаваться числом или функцией, читающей настройки."""
+    return interval() if callable(interval) else interval
+
+
+class Worker(Thread):
+    """Фоновый поток-демон, который можно остановить или разбудить из любого другого потока."""
+
+    def __init__(self, name: str):
+        super().__init__(name=name, daemon=True)
+        self.stop_event = Event()
+        self.wake_event = Event()
+
+    def stop(self) -> None:
+        """Устанавливает флаг остановки и будит поток."""
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def wake(self) -> None:
+        """Прерывает текущее ожидание потока досрочно."""
+        self.wake_event.set()
+
+    def sleep(self, seconds: float) -> bool:
+        """Ждёт заданное время или пробуждения, возвращает False, если поток нужно остановить."""
+        self.wake_event.wait(max(0.0, seconds))
+        self.wake_event.clear()
+        return not self.stop_event.is_set()
+
+
+class PeriodicWorker(Worker):
+    """Фоновый поток, вызывающий функцию сразу после запуска и затем с заданным интервалом."""
+
+    def __init__(self, name: str, function, interval):
+        super().__init__(name=name)
+        self.function = function
+        self.interval = interval
+
+    def run(self) -> None:
+        """Вызывает функцию до остановки потока, не давая исключению завершить поток."""
+        while not self.stop_event.is_set():
+            try:
+                self.function()
+            except Exception as e:
+                getLogger().error('Ошибка в фоновом потоке «%s»: %s', self.name, e)
+            if not self.sleep(resolve_interval(self.interval)):
+                break
@@ -0,0 +1,92 @@
+from math import floor
+from datetime import datetime
+from typing import NamedTuple
+
+
+class ZoneOffset(NamedTuple):
+    """Смещение пояса от UTC и подпись панели с сокращённым названием пояса, действующие в промежутке [since, until)."""
+    offset: int
+    label: str
+    since: float
+    until: float
+
+
+class WorldClock:
+    """
+    Часовые пояса панелей мирового времени. Смещение каждого пояса от UTC берётся из базы zoneinfo
+    и кэшируется до ближайшего перехода на летнее или зимнее время, поэтому на кадр для каждого пояса
+    остаются сравнение и несколько целочисленных операций над одним общим отсчётом времени.
+    """
+    __slots__ = ('names', 'zones', 'labels', 'offsets', 'missing', 'horizon')
+
+    def __init__(self, names: tuple[str, ...], horizon: float = 366 * 86400.0):
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+        self.names = names
+        self.horizon = horizon
+        self.zones: list = []
+        self.missing: list[str] = []
+        for name in names:
+            try:
+                self.zones.append(ZoneInfo(name))
+            except (ZoneInfoNotFoundError, ValueError):
+                self.zones.append(None)
+                self.missing.append(name)
+        self.labels: tuple[str, ...] = tuple(name.rsplit('/', 1)[-1].replace('_', ' ') for name in names)
+        self.offsets: list[ZoneOffset | None] = [None] * len(names)
+
+    @staticmethod
+    def get_offset(zone, timestamp: float) -> tuple[int, str]:
+        """Возвращает смещение пояса от UTC в секундах и его сокращённое название в заданный момент."""
+        moment: datetime = datetime.fromtimestamp(timestamp, zone)
+        return int(moment.utcoffset().total_seconds()), moment.tzname() or ''
+
+    def find_transition(self, zone, timestamp: float, current: tuple[int, str]) -> float:
+        """
+        Ищет ближайший момент смены смещения пояса: сначала шагами по суткам в пределах horizon,
+        затем делением промежутка пополам с точностью до секунды.
+        """
+        start: int = floor(timestamp)
+        end: int = start + int(self.horizon)
+        while start < end:
+            probe: int = min(start + 86400, end)
+            if self.get_offset(zone, probe) != current:
+                while probe - start > 1:
+                    middle: int = (start + probe) // 2
+                    if self.get_offset(zone, middle) == current:
+                        start = middle
+                    else:
+                        probe = middle
+                return float(probe)
+            start = probe
+        return float(end)
+
+    def get_zone_offset(self, index: int, timestamp: float) -> ZoneOffset | None:
+        """Возвращает смещение пояса из кэша, пересчитывая его только после перехода или при переводе часов назад."""
+        cached: ZoneOffset | None = self.offsets[index]
+        if cached is not None and cached.since <= timestamp < cached.until:
+            return cached
+        zone = self.zones[index]
+        if zone is None:
+            return None
+        current: tuple[int, str] = self.get_offset(zone, timestamp)
+        label, abbreviation = self.labels[index], current[1]
+        if abbreviation and abbreviation != label:
+            label = f'{label} {abbreviation}'
+        cached = ZoneOffset(current[0], label, timestamp, self.find_transition(zone, timestamp, current))
+        self.offsets[index] = cached
+        return cached
+
+    def sample(self, timestamp: float) -> list[tuple[str, int | None]]:
+        """
+        Возвращает для каждого пояса подпись и число секунд от начала местных суток для одного общего
+        отсчёта времени timestamp, или None вместо секунд, если пояс не найден.
+        """
+        second: int = floor(timestamp)
+        result: list[tuple[str, int | None]] = []
+        for index, label in enumerate(self.labels):
+            zone_offset: ZoneOffset | None = self.get_zone_offset(index, timestamp)
+            if zone_offset is None:
+                result.append((label, None))
+            else:
+                result.append((zone_offset.label, (second + zone_offset.offset) % 86400))
+        return result
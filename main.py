@@ -1,36 +1,194 @@
+import os
 import signal
-from time import sleep
+import argparse
+from time import sleep, monotonic
+from typing import TYPE_CHECKING
 
-from core.run import RunProgram
+if TYPE_CHECKING:
+    from core.run import RunProgram
+    from core.server import MetricsServer
+    from core.recorder import Recorder
 
-run = RunProgram()
+STARTED: float = monotonic()
+run: 'RunProgram | None' = None
 
 
-def main(name: str, version: str, year: int) -> None:
+def get_arguments() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description='ЭЛЕКТРОНИКА 54 (Clock)')
+    parser.add_argument(
+        '--runtime', choices=('threads', 'asyncio'), default='threads',
+        help='режим работы: фоновые потоки (по умолчанию) или цикл событий asyncio'
+    )
+    parser.add_argument(
+        '--output', choices=('ansi', 'jsonl', 'prometheus'), action='append',
+        help='вывод без curses, можно указать несколько раз'
+    )
+    parser.add_argument(
+        '--prometheus-file', default='clock.prom', help='файл метрик для вывода prometheus (по умолчанию clock.prom)'
+    )
+    parser.add_argument(
+        '--http', metavar='[HOST:]PORT',
+        help='запустить HTTP-сервер с json (/status) и метриками Prometheus (/metrics), по умолчанию на 127.0.0.1'
+    )
+    parser.add_argument(
+        '--aggregate', metavar='ADDRESS',
+        help='принимать показания других хостов по UDP «[HOST:]PORT» или Unix-сокету «unix:PATH» и показывать стойку'
+    )
+    parser.add_argument('--send', metavar='ADDRESS', help='отправлять показания агрегатору по этому адресу')
+    parser.add_argument(
+        '--simulate-hosts', type=int, metavar='N', help='вместо своих показаний отправлять кадры N вымышленных хостов'
+    )
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument(
+        '--record', metavar='FILE', help='записывать показания датчиков и информацию о системе в файлы FILE.NNNN'
+    )
+    recording.add_argument('--replay', metavar='FILE', help='воспроизвести запись FILE.NNNN вместо опроса датчиков')
+    parser.add_argument(
+        '--record-size', type=int, default=16, metavar='MIB', help='размер одного файла записи (по умолчанию 16 МиБ)'
+    )
+    parser.add_argument(
+        '--record-keep', type=int, default=8, metavar='N', help='сколько последних файлов записи хранить (8)'
+    )
+    parser.add_argument('--speed', type=int, choices=(1, 10, 100), default=1, help='ускорение воспроизведения')
+    parser.add_argument(
+        '--seek', metavar='TIME', help='начать воспроизведение с ISO-времени или через +SECONDS от начала записи'
+    )
+    parser.add_argument('--profile', metavar='FILE', help='запустить под cProfile и сохранить статистику в файл')
+    parser.add_argument(
+        '--tracemalloc', action='store_true', help='отслеживать выделения памяти и записать итог в журнал'
+    )
+    return parser.parse_args()
+
+
+def has_terminal() -> bool:
+    """Проверяет, есть ли у процесса управляющий терминал и не оборвана ли связь с ним."""
+    try:
+        os.close(os.open('/dev/tty', os.O_RDWR | getattr(os, 'O_NOCTTY', 0)))
+    except OSError:
+        return False
+    return True
+
+
+def create_program(runtime: str) -> 'RunProgram':
+    """
+    Создаёт программу для выбранного режима работы. Модули импортируются только для включённых возможностей:
+    asyncio — для режима asyncio, HTTP-сервер, сокеты и профилировщики — только по соответствующим ключам.
+    """
+    if runtime == 'asyncio':
+        from core.aio import AsyncRunProgram
+        return AsyncRunProgram()
+    from core.run import RunProgram
+    return RunProgram()
+
+
+def create_metrics_server(address: str | None) -> 'MetricsServer | None':
+    """Создаёт HTTP-сервер метрик по адресу вида «[HOST:]PORT»."""
+    if not address:
+        return None
+    from core.server import MetricsServer
+    host, _, port = address.rpartition(':')
+    try:
+        return MetricsServer(host or '127.0.0.1', int(port))
+    except (OSError, OverflowError, ValueError) as e:
+        raise SystemExit(f'Не удалось запустить HTTP-сервер на «{address}»: {e}')
+
+
+def create_backends(
+        outputs: list[str], prometheus_file: str, send: str | None = None, simulate_hosts: int | None = None
+) -> list:
+    """Создаёт способы вывода без curses по их названиям и отправку показаний агрегатору."""
+    if not outputs and not send:
+        return []
+    from core.backends import AnsiBackend, JsonLinesBackend, PrometheusBackend
+    backends: dict = {
+        'ansi': lambda: AnsiBackend(run),
+        'jsonl': lambda: JsonLinesBackend(),
+        'prometheus': lambda: PrometheusBackend(prometheus_file)
+    }
+    created: list = [backends[output]() for output in dict.fromkeys(outputs)]
+    if send:
+        from core.aggregator import FrameSender, SimulatedHostsSender
+        created.append(SimulatedHostsSender(send, simulate_hosts) if simulate_hosts else FrameSender(send))
+    return created
+
+
+def create_recorder(path: str | None, size: int, keep: int) -> 'Recorder | None':
+    """Создаёт запись показаний в файлы «PATH.NNNN» размером до size МиБ."""
+    if not path:
+        return None
+    from core.recorder import Recorder
+    return Recorder(path, size * 1024 * 1024, keep)
+
+
+def create_replay(path: str | None, speed: int, seek: str | None) -> tuple | None:
+    """Открывает запись для воспроизведения и возвращает её вместе с ускорением и моментом начала."""
+    if not path:
+        return None
+    from core.recorder import RecordingReader, parse_moment
+    try:
+        reader = RecordingReader(path)
+        return reader, speed, parse_moment(seek, reader.start) if seek else None
+    except (OSError, ValueError) as e:
+        raise SystemExit(f'Не удалось открыть запись: {e}')
+
+
+def main(
+        name: str, version: str, year: int, runtime: str = 'threads', backends: list | None = None,
+        server: 'MetricsServer | None' = None, aggregate: str | None = None, recorder: 'Recorder | None' = None,
+        replay: tuple | None = None
+) -> None:
     """Запускающая все процессы главная функция."""
 
     def get_handler(signum, _frame) -> None:
         run.running = False
         run.logger.info('Задействован обработчик сигналов для корректного завершения: %s', signum)
 
-    handler_tuple: tuple[str, str, str] = ('SIGHUP', 'SIGINT', 'SIGTERM')
-    for n in handler_tuple:
-        if hasattr(signal, n):
-            signal.signal(getattr(signal, n), get_handler)
+    def get_reload_handler(signum, frame) -> None:
+        if terminal and not has_terminal():
+            get_handler(signum, frame)
+            return None
+        run.request_reload()
+        run.logger.info('Задействован обработчик сигналов для перезагрузки данных: %s', signum)
+        return None
+
+    terminal: bool = has_terminal()
+    handlers: dict = {'SIGHUP': get_reload_handler, 'SIGINT': get_handler, 'SIGTERM': get_handler}
+    if runtime != 'asyncio' or backends:
+        for n, handler in handlers.items():
+            if hasattr(signal, n):
+                signal.signal(getattr(signal, n), handler)
 
     try:
         run.create_directories()
         run.get_logging_data()
         run.log_app_release(name=name, version=version, year=year)
         run.logger.info('Приложение запущено.')
-        run.create_wrapped_threads()
+        if replay is not None:
+            run.start_replay(*replay)
+        if server is not None:
+            run.start_metrics_server(server)
+        if aggregate:
+            run.start_aggregator(aggregate)
+        if recorder is not None:
+            run.start_recording(recorder)
+        if backends:
+            run.run_headless(backends)
+        elif runtime == 'asyncio':
+            import asyncio
+            asyncio.run(run.run_async(handlers))
+        else:
+            run.run_render_loop()
         while getattr(run, 'running', True):
             sleep(0.1)
+        run.stop_workers()
+        run.log_timings()
         run.logger.info('Приложение остановлено.')
     except Exception as e:
         run.logger.error(f'Проверка выдала ошибку: {e}\nЕсли не был выполнен выход в терминал, нажми Enter.')
         try:
             run.running = False
+            run.stop_workers()
             run.logger.info('Приложение остановлено.')
         except Exception:
             run.logger.exception(
@@ -38,5 +196,43 @@ def main(name: str, version: str, year: int) -> None:
             )
 
 
+def log_profile(path: str, limit: int = 20) -> None:
+    """Записывает в журнал самые затратные по суммарному времени функции из файла статистики cProfile."""
+    import io
+    import pstats
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).sort_stats('cumulative').print_stats(limit)
+    run.logger.info('Профиль cProfile (%s):\n%s', path, stream.getvalue())
+
+
+def log_allocations(limit: int = 10) -> None:
+    """Записывает в журнал места, где было выделено больше всего памяти."""
+    import tracemalloc
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    lines: list[str] = [str(statistic) for statistic in snapshot.statistics('lineno')[:limit]]
+    run.logger.info('tracemalloc: текущее %d Б, пик %d Б\n%s', current, peak, '\n'.join(lines))
+
+
 if __name__ == '__main__':
-    main('Clock', '1.0.9', 2026)
+    arguments: argparse.Namespace = get_arguments()
+    if arguments.tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+    run = create_program(arguments.runtime)
+    run.started = STARTED
+    parameters: tuple = (
+        'Clock', '1.0.9', 2026, arguments.runtime,
+        create_backends(arguments.output or [], arguments.prometheus_file, arguments.send, arguments.simulate_hosts),
+        create_metrics_server(arguments.http), arguments.aggregate,
+        create_recorder(arguments.record, arguments.record_size, arguments.record_keep),
+        create_replay(arguments.replay, arguments.speed, arguments.seek)
+    )
+    if arguments.profile:
+        import cProfile
+        cProfile.run('main(*parameters)', arguments.profile)
+        log_profile(arguments.profile)
+    else:
+        main(*parameters)
+    if arguments.tracemalloc:
+        log_allocations()